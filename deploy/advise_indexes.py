@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+advise_indexes.py — Offline index advisor for notebook SQL.
+
+Extracts the SQL strings from every workspace/*.Notebook/notebook-content.py,
+works out which columns each query joins, filters, groups and reads on every
+SalesLT table, and compares that with the primary keys and indexes declared in
+the SQL project. Access paths that no existing index can seek on (or that need
+key lookups because the index doesn't cover the query) become proposed
+nonclustered covering indexes, ranked by an estimated benefit score.
+
+References to columns that don't exist in the SQL project are reported too,
+since those queries will fail outright.
+
+Usage:
+    python deploy/advise_indexes.py                     # report only
+    python deploy/advise_indexes.py --write             # also write <schema>/Indexes/*.sql
+    python deploy/advise_indexes.py --rows SalesOrderDetail=5000000 --fail-above 50
+
+Benefit score: access weight (equality 10, join 6, range 5, group-by 3)
+x log10(estimated table rows), plus 1 per column the index covers, summed
+over every query that would use the index. It ranks proposals; it is not a
+cost estimate.
+
+Exit codes:
+  0 — analysis finished (proposals may exist)
+  1 — error, or a proposal scored at least --fail-above
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import logging
+import math
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sql_project import DEFAULT_PROJECT_DIR, Index, SqlProject, Table, load_sql_project
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S%z",
+)
+logger = logging.getLogger("fabric-cicd-index-advisor")
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+DEFAULT_REPO_DIR = "./workspace"
+NOTEBOOK_GLOB = "*.Notebook/notebook-content.py"
+CELL_MARKER = "# CELL "
+
+ACCESS_WEIGHTS = {"eq": 10, "join": 6, "range": 5, "group": 3}
+DEFAULT_ROW_ESTIMATE = 10_000
+TRANSACTIONAL_ROW_ESTIMATE = 1_000_000
+TRANSACTIONAL_DATE_COLUMNS = {"OrderDate", "DueDate", "ShipDate"}
+
+SQL_START_RE = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE)\b", re.IGNORECASE)
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<string>N?'(?:[^']|'')*')
+    |(?P<ident>(?:\[[^\]]+\]|[A-Za-z_@#][\w@#$]*)(?:\s*\.\s*(?:\[[^\]]+\]|[A-Za-z_][\w$]*))*)
+    |(?P<number>\d+(?:\.\d+)?)
+    |(?P<op><=|>=|<>|!=|[=<>(),*+\-/;?%])
+    """,
+    re.VERBOSE,
+)
+KEYWORDS = {
+    "SELECT", "TOP", "DISTINCT", "AS", "FROM", "JOIN", "INNER", "LEFT", "RIGHT", "FULL", "OUTER",
+    "CROSS", "APPLY", "ON", "WHERE", "AND", "OR", "NOT", "NULL", "IS", "IN", "BETWEEN", "LIKE",
+    "GROUP", "BY", "HAVING", "ORDER", "ASC", "DESC", "CASE", "WHEN", "THEN", "ELSE", "END",
+    "UNION", "ALL", "EXISTS", "SET", "UPDATE", "DELETE", "INSERT", "INTO", "VALUES", "OUTPUT",
+    "WITH", "OVER", "PARTITION", "YEAR", "QUARTER", "MONTH", "WEEK", "DAY", "HOUR", "MINUTE", "SECOND",
+}
+CLAUSE_KEYWORDS = {"SELECT", "FROM", "WHERE", "GROUP", "HAVING", "ORDER", "UPDATE", "SET", "DELETE"}
+RANGE_OPERATORS = {"<", ">", "<=", ">=", "BETWEEN", "LIKE"}
+
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Query:
+    notebook: str
+    cell: int
+    name: str
+    sql: str
+
+    @property
+    def label(self) -> str:
+        return f"{self.notebook} cell {self.cell} ({self.name})"
+
+
+@dataclass
+class TableUsage:
+    table: Table
+    eq: list[str] = field(default_factory=list)
+    join: list[str] = field(default_factory=list)
+    range: list[str] = field(default_factory=list)
+    group: list[str] = field(default_factory=list)
+    referenced: list[str] = field(default_factory=list)
+
+    def add(self, kind: str, column: str) -> None:
+        bucket = getattr(self, kind)
+        if column not in bucket:
+            bucket.append(column)
+        if column not in self.referenced:
+            self.referenced.append(column)
+
+
+@dataclass
+class Proposal:
+    table: Table
+    keys: list[str]
+    include: list[str]
+    benefit: float = 0.0
+    queries: list[str] = field(default_factory=list)
+    extends: str | None = None
+
+    @property
+    def name(self) -> str:
+        suffix = "_Covering" if self.include else ""
+        return f"IX_{self.table.name}_{'_'.join(self.keys)}{suffix}"
+
+    def to_sql(self) -> str:
+        keys = ", ".join(f"[{k}] ASC" for k in self.keys)
+        lines = [
+            "-- Proposed by deploy/advise_indexes.py",
+            f"-- Estimated benefit score: {self.benefit:.1f}",
+            *(f"-- Used by: {q}" for q in self.queries),
+        ]
+        if self.extends:
+            lines.append(f"-- Supersedes {self.extends}; drop it when this index is created.")
+        lines += [
+            f"CREATE NONCLUSTERED INDEX [{self.name}]",
+            f"    ON [{self.table.schema}].[{self.table.name}]({keys})"
+            + (f"\n    INCLUDE({', '.join(f'[{c}]' for c in self.include)})" if self.include else "")
+            + ";",
+            "",
+            "",
+            "GO",
+            "",
+        ]
+        return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# SQL extraction
+# ---------------------------------------------------------------------------
+
+def extract_queries(notebook_path: Path) -> list[Query]:
+    """SQL string literals in a notebook, tagged with their cell number and variable name."""
+    source = notebook_path.read_text(encoding="utf-8-sig")
+    cell_starts = [i + 1 for i, line in enumerate(source.splitlines()) if line.startswith(CELL_MARKER)]
+    notebook = notebook_path.parent.name.rsplit(".", 1)[0]
+
+    tree = ast.parse(source)
+    names: dict[int, str] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant) and isinstance(node.targets[0], ast.Name):
+            names[id(node.value)] = node.targets[0].id
+        elif isinstance(node, ast.Call) and node.args and isinstance(node.args[0], ast.Constant):
+            names[id(node.args[0])] = ast.unparse(node.func)
+
+    queries = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and SQL_START_RE.match(node.value):
+            cell = sum(1 for start in cell_starts if start <= node.lineno)
+            queries.append(Query(notebook, cell, names.get(id(node), f"line {node.lineno}"), node.value))
+    return sorted(queries, key=lambda q: (q.cell, q.name))
+
+
+# ---------------------------------------------------------------------------
+# SQL analysis
+# ---------------------------------------------------------------------------
+
+def tokenize(sql: str) -> list[str]:
+    sql = re.sub(r"--[^\n]*", " ", sql)
+    return [m.group(0) for m in _TOKEN_RE.finditer(sql)]
+
+
+def _ident_parts(token: str) -> list[str]:
+    return [p.strip().strip("[]") for p in token.split(".")]
+
+
+def _is_ident(token: str) -> bool:
+    return bool(re.match(r"[\[A-Za-z_@#]", token)) and token.upper() not in KEYWORDS
+
+
+def _split_clauses(tokens: list) -> dict[str, list]:
+    """Split a flat (subquery-free) token list into its top-level clauses."""
+    clauses: dict[str, list] = {}
+    current, depth, i = None, 0, 0
+    while i < len(tokens):
+        token = tokens[i]
+        upper = token.upper() if isinstance(token, str) else ""
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        if depth == 0 and upper in CLAUSE_KEYWORDS:
+            if upper in ("GROUP", "ORDER") and i + 1 < len(tokens) and str(tokens[i + 1]).upper() == "BY":
+                i += 1
+            current = upper
+            clauses.setdefault(current, [])
+        elif current:
+            clauses[current].append(token)
+        i += 1
+    return clauses
+
+
+class _Scope:
+    """One SELECT/UPDATE/DELETE block: its table aliases and the usage it records."""
+
+    def __init__(self, project: SqlProject, usages: dict[str, TableUsage], unknown: set[str]):
+        self.project = project
+        self.usages = usages
+        self.unknown = unknown
+        self.aliases: dict[str, Table | None] = {}
+        self.select_aliases: set[str] = set()
+
+    def bind(self, ref, alias: str | None) -> None:
+        table = self.project.table(".".join(_ident_parts(ref))) if isinstance(ref, str) else None
+        name = alias or (table.name if table else None)
+        if name:
+            self.aliases[name.lower()] = table
+        if table:
+            self.aliases.setdefault(table.name.lower(), table)
+            self.aliases.setdefault(table.full_name.lower(), table)
+
+    def resolve(self, token) -> tuple[Table, str] | None:
+        if not isinstance(token, str) or not _is_ident(token):
+            return None
+        parts = _ident_parts(token)
+        if len(parts) >= 2:
+            table = self.aliases.get(".".join(parts[:-1]).lower())
+            if table is None:
+                return None
+            if table.column(parts[-1]) is None:
+                self.unknown.add(f"{table.full_name}.{parts[-1]}")
+                return None
+            return table, table.column(parts[-1]).name
+        if parts[0] in self.select_aliases:
+            return None
+        tables = {t.full_name: t for t in self.aliases.values() if t is not None}
+        matches = [t for t in tables.values() if t.column(parts[0])]
+        if len(matches) == 1:
+            return matches[0], matches[0].column(parts[0]).name
+        if not matches and len(tables) == 1:
+            self.unknown.add(f"{next(iter(tables))}.{parts[0]}")
+        return None
+
+    def record(self, token, kind: str) -> tuple[Table, str] | None:
+        resolved = self.resolve(token)
+        if resolved:
+            table, column = resolved
+            self.usages.setdefault(table.full_name, TableUsage(table)).add(kind, column)
+        return resolved
+
+
+def _column_tokens(tokens: list) -> list[int]:
+    """Indexes of tokens that may be column references (identifiers not used as functions)."""
+    return [
+        i for i, t in enumerate(tokens)
+        if isinstance(t, str) and _is_ident(t) and not (i + 1 < len(tokens) and tokens[i + 1] == "(")
+    ]
+
+
+def _analyze_predicates(tokens: list, scope: _Scope) -> None:
+    """Classify each column in a WHERE/ON predicate as a join, equality or range access."""
+    for i in _column_tokens(tokens):
+        nxt = str(tokens[i + 1]).upper() if i + 1 < len(tokens) else ""
+        prev = str(tokens[i - 1]).upper() if i > 0 else ""
+        other = tokens[i + 2] if nxt == "=" and i + 2 < len(tokens) else tokens[i - 2] if prev == "=" and i >= 2 else None
+        mine = scope.resolve(tokens[i])
+        if mine is None:
+            continue
+        partner = scope.resolve(other) if other is not None else None
+        if partner and partner[0] is not mine[0]:
+            scope.record(tokens[i], "join")
+        elif nxt in ("=", "IN", "IS") or prev == "=":
+            scope.record(tokens[i], "eq")
+        elif nxt in RANGE_OPERATORS or prev in RANGE_OPERATORS or nxt == "NOT":
+            scope.record(tokens[i], "range")
+        else:
+            scope.record(tokens[i], "referenced")
+
+
+def _parse_from(tokens: list, scope: _Scope) -> list[list]:
+    """Bind table aliases from a FROM clause; return the ON-condition token lists."""
+    conditions, i = [], 0
+    join_words = {"INNER", "LEFT", "RIGHT", "FULL", "OUTER", "CROSS", "JOIN", ","}
+    while i < len(tokens):
+        token = tokens[i]
+        if isinstance(token, str) and token.upper() in join_words:
+            i += 1
+            continue
+        if isinstance(token, str) and token.upper() == "ON":
+            j = i + 1
+            while j < len(tokens) and not (isinstance(tokens[j], str) and tokens[j].upper() in join_words - {","}):
+                j += 1
+            conditions.append(tokens[i + 1:j])
+            i = j
+            continue
+        alias = None
+        j = i + 1
+        if j < len(tokens) and isinstance(tokens[j], str) and tokens[j].upper() == "AS":
+            j += 1
+        if j < len(tokens) and isinstance(tokens[j], str) and _is_ident(tokens[j]) and "." not in tokens[j]:
+            alias = tokens[j].strip("[]")
+            j += 1
+        scope.bind(token, alias)
+        i = j
+    return conditions
+
+
+def analyze_sql(sql: str, project: SqlProject, unknown: set[str] | None = None) -> dict[str, TableUsage]:
+    """Per-table column usage of one SQL statement, including its subqueries."""
+    usages: dict[str, TableUsage] = {}
+    unknown = unknown if unknown is not None else set()
+
+    def collapse(tokens: list) -> list:
+        out, i = [], 0
+        while i < len(tokens):
+            if tokens[i] == "(" and i + 1 < len(tokens) and str(tokens[i + 1]).upper() == "SELECT":
+                depth, j = 0, i
+                while j < len(tokens):
+                    depth += 1 if tokens[j] == "(" else -1 if tokens[j] == ")" else 0
+                    if depth == 0:
+                        break
+                    j += 1
+                analyze_block(tokens[i + 1:j])
+                out.append(("subquery",))
+                i = j + 1
+            else:
+                out.append(tokens[i])
+                i += 1
+        return out
+
+    def analyze_block(tokens: list) -> None:
+        clauses = _split_clauses(collapse(tokens))
+        scope = _Scope(project, usages, unknown)
+        target = clauses.get("UPDATE") or clauses.get("DELETE") or []
+        if target:
+            scope.bind(target[0], None)
+        conditions = _parse_from(clauses.get("FROM", []), scope)
+
+        for condition in conditions:
+            _analyze_predicates(condition, scope)
+        _analyze_predicates(clauses.get("WHERE", []), scope)
+        _analyze_predicates(clauses.get("HAVING", []), scope)
+        for i in _column_tokens(clauses.get("GROUP", [])):
+            scope.record(clauses["GROUP"][i], "group")
+
+        select = clauses.get("SELECT", [])
+        for part in ("SELECT", "SET", "ORDER"):
+            part_tokens = clauses.get(part, [])
+            if part == "ORDER":
+                # SELECT-list aliases are only visible to ORDER BY.
+                scope.select_aliases = {
+                    str(select[i + 1]).strip("[]") for i, t in enumerate(select[:-1]) if str(t).upper() == "AS"
+                }
+            for i in _column_tokens(part_tokens):
+                if part == "SELECT" and i > 0 and str(part_tokens[i - 1]).upper() == "AS":
+                    continue
+                scope.record(part_tokens[i], "referenced")
+
+    analyze_block(tokenize(sql))
+    return usages
+
+
+# ---------------------------------------------------------------------------
+# Index matching
+# ---------------------------------------------------------------------------
+
+def _seekable(index: Index, keys: list[str]) -> bool:
+    """True when ``keys`` (in any order) form the leading key columns of ``index``."""
+    return [k.lower() for k in sorted(index.columns[:len(keys)])] == [k.lower() for k in sorted(keys)]
+
+
+def _available(index: Index, table: Table) -> set[str]:
+    cols = set(index.columns) | set(index.include)
+    # Nonclustered indexes carry the clustering key as a row locator.
+    clustered = next((ix for ix in table.indexes if ix.clustered), None)
+    if clustered:
+        cols |= set(clustered.columns)
+    return cols
+
+
+def candidates(usage: TableUsage) -> list[list[str]]:
+    """Key column lists an index could seek on for this table's part of a query."""
+    prefix = list(usage.eq)
+    result = []
+    if prefix:
+        result.append(prefix + usage.range[:1])
+    for column in usage.join:
+        if column not in prefix:
+            result.append(prefix + [column])
+    if not result and usage.range:
+        result.append(usage.range[:1])
+    if not result and usage.group:
+        result.append(list(usage.group))
+    return result
+
+
+def _access_kind(usage: TableUsage, keys: list[str]) -> str:
+    last = keys[-1]
+    for kind in ("eq", "join", "range", "group"):
+        if last in getattr(usage, kind):
+            return kind
+    return "group"
+
+
+def propose(queries: list[Query], project: SqlProject, row_estimates: dict[str, int],
+            unknown: set[str]) -> list[Proposal]:
+    proposals: dict[tuple[str, tuple[str, ...]], Proposal] = {}
+    transactional = project.transactional_tables(TRANSACTIONAL_DATE_COLUMNS)
+
+    for query in queries:
+        for usage in analyze_sql(query.sql, project, unknown).values():
+            table = usage.table
+            rows = row_estimates.get(table.name, TRANSACTIONAL_ROW_ESTIMATE
+                                     if table.full_name in transactional else DEFAULT_ROW_ESTIMATE)
+            for keys in candidates(usage):
+                needed = set(usage.referenced) | set(keys)
+                seek = [ix for ix in table.indexes if _seekable(ix, keys)]
+                if any(ix.clustered or needed <= _available(ix, table) for ix in seek):
+                    continue
+                clustered = next((ix for ix in table.indexes if ix.clustered), None)
+                implicit = set(clustered.columns) if clustered else set()
+                include = [c for c in usage.referenced if c not in keys and c not in implicit]
+                key = (table.full_name, tuple(keys))
+                proposal = proposals.setdefault(key, Proposal(table, list(keys), []))
+                proposal.include += [c for c in include if c not in proposal.include]
+                proposal.benefit += ACCESS_WEIGHTS[_access_kind(usage, keys)] * math.log10(max(rows, 10)) + len(include)
+                if query.label not in proposal.queries:
+                    proposal.queries.append(query.label)
+                extended = next((ix for ix in seek if not ix.unique and ix.columns == keys), None)
+                if extended:
+                    proposal.extends = extended.name
+
+    return sorted(proposals.values(), key=lambda p: p.benefit, reverse=True)
+
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+def _parse_rows(values: list[str]) -> dict[str, int]:
+    rows = {}
+    for raw in values:
+        name, _, count = raw.partition("=")
+        if not name or not count.isdigit():
+            raise ValueError(f"Invalid --rows value '{raw}'. Expected TABLE=ROWS.")
+        rows[name.split(".")[-1]] = int(count)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--repo-dir", default=DEFAULT_REPO_DIR, help="Workspace directory with *.Notebook items")
+    parser.add_argument("--project-dir", default=DEFAULT_PROJECT_DIR, help="SQL project directory")
+    parser.add_argument("--rows", action="append", default=[], metavar="TABLE=ROWS",
+                        help="Row count estimate for a table (repeatable)")
+    parser.add_argument("--write", action="store_true", help="Write proposals to <schema>/Indexes/*.sql")
+    parser.add_argument("--json-out", help="Write proposals as JSON to this path")
+    parser.add_argument("--fail-above", type=float, help="Exit 1 if any proposal scores at least this much")
+    args = parser.parse_args()
+
+    try:
+        row_estimates = _parse_rows(args.rows)
+        project = load_sql_project(args.project_dir)
+        queries = [q for nb in sorted(Path(args.repo_dir).glob(NOTEBOOK_GLOB)) for q in extract_queries(nb)]
+    except (OSError, SyntaxError, ValueError) as exc:
+        logger.error("%s", exc)
+        sys.exit(1)
+    logger.info("Analyzing %d SQL statement(s) against %d table(s).", len(queries), len(project.tables))
+
+    unknown: set[str] = set()
+    proposals = propose(queries, project, row_estimates, unknown)
+
+    for column in sorted(unknown):
+        logger.warning("Column %s is referenced by a notebook query but not defined in the SQL project.", column)
+    if not proposals:
+        logger.info("All analyzed access paths are served by existing indexes.")
+    for rank, proposal in enumerate(proposals, 1):
+        logger.info("%2d. %-55s benefit %6.1f", rank, proposal.name, proposal.benefit)
+        logger.info("      keys (%s)%s", ", ".join(proposal.keys),
+                    f" include ({', '.join(proposal.include)})" if proposal.include else "")
+        for label in proposal.queries:
+            logger.info("      used by %s", label)
+        if proposal.extends:
+            logger.info("      supersedes %s", proposal.extends)
+
+    if args.write:
+        for proposal in proposals:
+            path = Path(args.project_dir) / proposal.table.schema / "Indexes" / f"{proposal.name}.sql"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(proposal.to_sql(), encoding="utf-8")
+            logger.info("Wrote %s", path)
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps([
+            {
+                "name": p.name, "table": p.table.full_name, "keys": p.keys, "include": p.include,
+                "benefit": round(p.benefit, 1), "queries": p.queries, "supersedes": p.extends,
+            }
+            for p in proposals
+        ], indent=2), encoding="utf-8")
+
+    if args.fail_above is not None and any(p.benefit >= args.fail_above for p in proposals):
+        logger.error("Index proposals scored at or above %.1f; add the indexes or raise the threshold.", args.fail_above)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+bench_dab.py — Replay a REST request mix against Data API builder.
+
+By default the harness starts an in-process stand-in for DAB: a small HTTP
+server that implements the REST subset we use ($first / $after keyset paging,
+$select, point lookups by primary key, per-entity response caching and read
+field projections) on top of a local SQLite database built from the SQL
+project DDL (same primary keys and indexes) and seeded with random rows.
+Point --base-url at a running `dab start` instead to benchmark the real thing.
+
+Pass --config more than once to compare configurations on the same data, e.g.
+the hand-written config against the generated one:
+
+    git show HEAD~1:dab-config.json > /tmp/dab-baseline.json
+    python deploy/bench_dab.py --config /tmp/dab-baseline.json --config dab-config.json
+
+Usage:
+    python deploy/bench_dab.py [--rows 5000] [--requests 2000] [--concurrency 8]
+    python deploy/bench_dab.py --base-url http://localhost:5000
+
+Only tables are served by the stand-in; view entities are skipped because the
+view definitions are T-SQL specific.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlencode, urlparse
+from urllib.request import urlopen
+
+from sql_project import DEFAULT_PROJECT_DIR, Column, SqlProject, Table, load_sql_project
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S%z",
+)
+logger = logging.getLogger("fabric-cicd-bench-dab")
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+DEFAULT_CONFIG_PATH = "./dab-config.json"
+DEFAULT_ROWS = 5000
+DEFAULT_REQUESTS = 2000
+DEFAULT_CONCURRENCY = 8
+
+# DAB defaults when runtime.pagination is not configured.
+DAB_DEFAULT_PAGE_SIZE = 100
+DAB_MAX_PAGE_SIZE = 100000
+
+# Share of each request kind in the replayed mix.
+REQUEST_MIX = {
+    "list": 0.45,       # GET /api/<Entity>               (first page, default size)
+    "lookup": 0.30,     # GET /api/<Entity>/<pk>/<value>
+    "page_walk": 0.15,  # follow nextLink for up to PAGE_WALK_DEPTH pages
+    "bulk": 0.10,       # GET /api/<Entity>?$first=-1     (clamped to max-page-size)
+}
+PAGE_WALK_DEPTH = 5
+LOB_BYTES = 2048
+
+
+# ---------------------------------------------------------------------------
+# Local database stand-in
+# ---------------------------------------------------------------------------
+
+def _sqlite_type(column: Column) -> str:
+    base = column.base_type
+    if base in {"INT", "BIGINT", "SMALLINT", "TINYINT", "BIT"}:
+        return "INTEGER"
+    if base in {"MONEY", "SMALLMONEY", "DECIMAL", "NUMERIC", "FLOAT", "REAL"}:
+        return "REAL"
+    if base in {"VARBINARY", "BINARY", "IMAGE"}:
+        return "BLOB"
+    return "TEXT"
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _load_order(tables: list[Table]) -> list[Table]:
+    """Parents before children so FK columns can pick existing keys."""
+    by_name = {t.full_name: t for t in tables}
+    ordered, seen = [], set()
+
+    def visit(table: Table) -> None:
+        if table.full_name in seen:
+            return
+        seen.add(table.full_name)
+        for fk in table.foreign_keys:
+            parent = by_name.get(fk.ref_table)
+            if parent and parent is not table:
+                visit(parent)
+        ordered.append(table)
+
+    for table in tables:
+        visit(table)
+    return ordered
+
+
+def _random_value(column: Column, row: int, rng: random.Random):
+    kind = _sqlite_type(column)
+    if column.base_type == "BIT":
+        return rng.randint(0, 1)
+    if column.base_type == "UNIQUEIDENTIFIER":
+        return str(uuid.UUID(int=rng.getrandbits(128)))
+    if column.base_type in {"DATETIME", "DATETIME2", "DATE", "SMALLDATETIME"}:
+        return (datetime(2023, 1, 1) + timedelta(minutes=rng.randint(0, 3 * 365 * 24 * 60))).isoformat()
+    if kind == "INTEGER":
+        return rng.randint(1, 100) if column.base_type != "TINYINT" else rng.randint(0, 8)
+    if kind == "REAL":
+        return round(rng.uniform(1, 5000), 2)
+    if kind == "BLOB":
+        return rng.randbytes(LOB_BYTES)
+    return f"{column.name}-{row}"
+
+
+def build_standin_db(project: SqlProject, path: str, rows: int, seed: int) -> None:
+    """Create every table (PKs and indexes included) in SQLite and seed ``rows`` rows each."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    keys: dict[str, list] = {}
+    for table in _load_order(list(project.tables.values())):
+        cols = ", ".join(f"{_quote(c.name)} {_sqlite_type(c)}" for c in table.columns)
+        pk = ", ".join(_quote(c) for c in table.primary_key)
+        conn.execute(f"CREATE TABLE {_quote(table.full_name)} ({cols}, PRIMARY KEY ({pk}))")
+        for index in table.indexes:
+            if index.primary_key:
+                continue
+            unique = "UNIQUE " if index.unique else ""
+            conn.execute(
+                f"CREATE {unique}INDEX {_quote(index.name)} ON {_quote(table.full_name)} "
+                f"({', '.join(_quote(c) for c in index.columns + index.include)})"
+            )
+
+        fk_sources = {
+            fk.columns[0]: fk.ref_table for fk in table.foreign_keys
+            if len(fk.columns) == 1 and fk.ref_table != table.full_name
+        }
+        single_pk = table.primary_key[0] if len(table.primary_key) == 1 else None
+        batch = []
+        for row in range(1, rows + 1):
+            values = []
+            for column in table.columns:
+                if column.name == single_pk and _sqlite_type(column) == "INTEGER":
+                    values.append(row)
+                elif column.name in fk_sources and keys.get(fk_sources[column.name]):
+                    values.append(rng.choice(keys[fk_sources[column.name]]))
+                elif column.nullable and any(fk.columns == [column.name] for fk in table.foreign_keys):
+                    values.append(None)
+                else:
+                    values.append(_random_value(column, row, rng))
+            batch.append(values)
+        placeholders = ", ".join("?" for _ in table.columns)
+        conn.executemany(f"INSERT OR IGNORE INTO {_quote(table.full_name)} VALUES ({placeholders})", batch)
+        if single_pk:
+            keys[table.full_name] = [r[0] for r in conn.execute(
+                f"SELECT {_quote(single_pk)} FROM {_quote(table.full_name)}"
+            )]
+    conn.commit()
+    conn.close()
+
+
+class _EntityRoute:
+    def __init__(self, name: str, table: Table, entity: dict, default_ttl: int):
+        self.name = name
+        self.table = table
+        self.keys = list(table.primary_key)
+        cache = entity.get("cache", {})
+        # Entity caching only applies when the runtime cache is switched on.
+        self.ttl = cache.get("ttl-seconds", default_ttl) if cache.get("enabled") and default_ttl else 0
+        excluded: set[str] = set()
+        for permission in entity.get("permissions", []):
+            for action in permission.get("actions", []):
+                if isinstance(action, dict) and action.get("action") in ("read", "*"):
+                    excluded.update(action.get("fields", {}).get("exclude", []))
+        self.columns = [c.name for c in table.columns if c.name not in excluded]
+
+
+class DabStandIn:
+    """Minimal DAB REST emulation over SQLite, driven by a dab-config document."""
+
+    def __init__(self, config: dict, project: SqlProject, db_path: str):
+        runtime = config.get("runtime", {})
+        pagination = runtime.get("pagination", {})
+        self.default_page = pagination.get("default-page-size", DAB_DEFAULT_PAGE_SIZE)
+        self.max_page = pagination.get("max-page-size", DAB_MAX_PAGE_SIZE)
+        cache = runtime.get("cache", {})
+        default_ttl = cache.get("ttl-seconds", 5) if cache.get("enabled") else 0
+        self.rest_path = runtime.get("rest", {}).get("path", "/api")
+
+        self.routes: dict[str, _EntityRoute] = {}
+        for name, entity in config.get("entities", {}).items():
+            source = entity.get("source", {})
+            table = project.table(source.get("object", ""))
+            if source.get("type", "table") == "table" and table:
+                self.routes[name] = _EntityRoute(name, table, entity, default_ttl)
+
+        self._db_path = db_path
+        self._local = threading.local()
+        self._cache: dict[str, tuple[float, bytes]] = {}
+        self._cache_lock = threading.Lock()
+        self.server: ThreadingHTTPServer | None = None
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def _list(self, route: _EntityRoute, query: dict[str, list[str]], path: str) -> dict:
+        first = int(query.get("$first", [self.default_page])[0])
+        limit = self.max_page if first == -1 else min(first, self.max_page)
+        select = query.get("$select", [""])[0]
+        columns = [c for c in select.split(",") if c in route.columns] if select else route.columns
+        columns = columns + [k for k in route.keys if k not in columns]
+
+        where, params = "", []
+        if "$after" in query:
+            after = json.loads(base64.urlsafe_b64decode(query["$after"][0]))
+            where = f"WHERE ({', '.join(_quote(k) for k in route.keys)}) > ({', '.join('?' for _ in route.keys)})"
+            params = [after[k] for k in route.keys]
+        sql = (
+            f"SELECT {', '.join(_quote(c) for c in columns)} FROM {_quote(route.table.full_name)} {where} "
+            f"ORDER BY {', '.join(_quote(k) for k in route.keys)} LIMIT ?"
+        )
+        rows = self._conn().execute(sql, [*params, limit + 1]).fetchall()
+        records = [dict(zip(columns, r)) for r in rows[:limit]]
+        body = {"value": records}
+        if len(rows) > limit:
+            cursor = base64.urlsafe_b64encode(json.dumps({k: records[-1][k] for k in route.keys}).encode()).decode()
+            next_query = {k: v[0] for k, v in query.items() if k != "$after"}
+            next_query["$after"] = cursor
+            body["nextLink"] = f"{path}?{urlencode(next_query)}"
+        return body
+
+    def _lookup(self, route: _EntityRoute, segments: list[str]) -> dict:
+        pairs = dict(zip(segments[0::2], segments[1::2]))
+        if sorted(pairs) != sorted(route.keys):
+            raise KeyError("primary key")
+        sql = (
+            f"SELECT {', '.join(_quote(c) for c in route.columns)} FROM {_quote(route.table.full_name)} "
+            f"WHERE {' AND '.join(f'{_quote(k)} = ?' for k in route.keys)}"
+        )
+        rows = self._conn().execute(sql, [pairs[k] for k in route.keys]).fetchall()
+        return {"value": [dict(zip(route.columns, r)) for r in rows]}
+
+    def handle(self, raw_path: str) -> tuple[int, bytes]:
+        parsed = urlparse(raw_path)
+        segments = [s for s in parsed.path[len(self.rest_path):].split("/") if s]
+        route = self.routes.get(segments[0]) if segments else None
+        if route is None:
+            return 404, b'{"error": "entity not found"}'
+
+        now = time.monotonic()
+        if route.ttl:
+            with self._cache_lock:
+                hit = self._cache.get(raw_path)
+            if hit and hit[0] > now:
+                return 200, hit[1]
+
+        try:
+            if len(segments) > 1:
+                body = self._lookup(route, segments[1:])
+            else:
+                body = self._list(route, parse_qs(parsed.query), parsed.path)
+        except (KeyError, ValueError):
+            return 400, b'{"error": "bad request"}'
+        payload = json.dumps(body, default=lambda v: base64.b64encode(v).decode()).encode()
+
+        if route.ttl:
+            with self._cache_lock:
+                self._cache[raw_path] = (now + route.ttl, payload)
+        return 200, payload
+
+    def start(self) -> str:
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802 — http.server naming
+                status, payload = standin.handle(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self) -> None:
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+def _get(url: str) -> tuple[bytes, float]:
+    start = time.perf_counter()
+    with urlopen(url, timeout=60) as response:
+        body = response.read()
+    return body, time.perf_counter() - start
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def build_request_mix(entities: dict[str, list[str]], sample_keys: dict[str, list[dict]],
+                      count: int, seed: int) -> list[tuple[str, str, str]]:
+    """Return ``(kind, entity, path)`` tuples; identical for a given seed."""
+    rng = random.Random(seed)
+    kinds, weights = zip(*REQUEST_MIX.items())
+    names = sorted(entities)
+    plan = []
+    for _ in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        name = rng.choice(names)
+        if kind == "lookup" and sample_keys.get(name):
+            key = rng.choice(sample_keys[name])
+            path = f"/{name}/" + "/".join(f"{k}/{quote(str(key[k]))}" for k in entities[name])
+        elif kind == "bulk":
+            path = f"/{name}?$first=-1"
+        else:
+            kind = "list" if kind == "lookup" else kind
+            path = f"/{name}"
+        plan.append((kind, name, path))
+    return plan
+
+
+def replay(base_url: str, rest_path: str, entities: dict[str, list[str]],
+           requests: int, concurrency: int, seed: int) -> dict:
+    """Discover keys, replay the mix and return latency stats per request kind."""
+    api = base_url.rstrip("/") + rest_path
+    sample_keys = {}
+    for name, keys in entities.items():
+        body, _ = _get(f"{api}/{name}?$first=50&$select={','.join(keys)}")
+        sample_keys[name] = json.loads(body).get("value", [])
+
+    def run(item: tuple[str, str, str]) -> tuple[str, float, int]:
+        kind, _, path = item
+        elapsed, size, url = 0.0, 0, api + path
+        for _ in range(PAGE_WALK_DEPTH if kind == "page_walk" else 1):
+            body, took = _get(url)
+            elapsed, size = elapsed + took, size + len(body)
+            next_link = json.loads(body).get("nextLink") if kind == "page_walk" else None
+            if not next_link:
+                break
+            url = next_link if next_link.startswith("http") else base_url.rstrip("/") + next_link
+        return kind, elapsed, size
+
+    plan = build_request_mix(entities, sample_keys, requests, seed)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(run, plan))
+    wall = time.perf_counter() - start
+
+    stats = {"wall_seconds": wall, "throughput_rps": len(results) / wall if wall else 0.0, "kinds": {}}
+    for kind in REQUEST_MIX:
+        timings = sorted(t for k, t, _ in results if k == kind)
+        size = sum(s for k, _, s in results if k == kind)
+        if timings:
+            stats["kinds"][kind] = {
+                "count": len(timings),
+                "p50_ms": _percentile(timings, 50) * 1000,
+                "p95_ms": _percentile(timings, 95) * 1000,
+                "p99_ms": _percentile(timings, 99) * 1000,
+                "avg_kb": size / len(timings) / 1024,
+            }
+    return stats
+
+
+def _log_stats(label: str, stats: dict) -> None:
+    logger.info("=" * 72)
+    logger.info("%s — %.0f req/s, %.1f s wall", label, stats["throughput_rps"], stats["wall_seconds"])
+    logger.info("  %-10s %7s %9s %9s %9s %9s", "kind", "count", "p50 ms", "p95 ms", "p99 ms", "avg KB")
+    for kind, s in stats["kinds"].items():
+        logger.info(
+            "  %-10s %7d %9.2f %9.2f %9.2f %9.1f",
+            kind, s["count"], s["p50_ms"], s["p95_ms"], s["p99_ms"], s["avg_kb"],
+        )
+
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--config", action="append", help="dab-config.json to benchmark (repeatable)")
+    parser.add_argument("--project-dir", default=DEFAULT_PROJECT_DIR, help="SQL project directory")
+    parser.add_argument("--base-url", help="Benchmark a running DAB instance instead of the stand-in")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Rows seeded per table")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json-out", help="Write raw results as JSON to this path")
+    args = parser.parse_args()
+
+    config_paths = args.config or [DEFAULT_CONFIG_PATH]
+    try:
+        project = load_sql_project(args.project_dir)
+        configs = [(p, json.loads(Path(p).read_text(encoding="utf-8"))) for p in config_paths]
+    except (OSError, ValueError) as exc:
+        logger.error("%s", exc)
+        sys.exit(1)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "standin.db")
+        if not args.base_url:
+            logger.info("Seeding local stand-in database with %d rows per table…", args.rows)
+            build_standin_db(project, db_path, args.rows, args.seed)
+
+        for path, config in configs:
+            standin = None
+            if args.base_url:
+                base_url = args.base_url
+            else:
+                standin = DabStandIn(config, project, db_path)
+                base_url = standin.start()
+            rest_path = config.get("runtime", {}).get("rest", {}).get("path", "/api")
+            entities = {}
+            for name, entity in config.get("entities", {}).items():
+                table = project.table(entity.get("source", {}).get("object", ""))
+                if entity.get("source", {}).get("type", "table") == "table" and table:
+                    entities[name] = list(table.primary_key)
+            try:
+                results[path] = replay(base_url, rest_path, entities, args.requests, args.concurrency, args.seed)
+            finally:
+                if standin:
+                    standin.stop()
+            _log_stats(path, results[path])
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        logger.info("Results written to %s", args.json_out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+"""
+check_drift.py — Detect direct edits to deployed workspaces (drift from the repository).
+
+For each target workspace, lists the deployed items and compares them with the
+item folders under workspace/:
+
+  * items missing from the workspace, or deployed but not in the repository
+    (for the item types in scope), are reported from the item listing alone;
+  * item definitions are fetched concurrently, the parameter.yml find_replace
+    rules for that environment are reversed (QA/PROD values back to the DEV
+    values the repository holds), parts are normalized (BOM, line endings,
+    trailing whitespace, JSON formatting, the report's dataset binding) and
+    hashed, and the hashes are compared with the repository's.
+
+Semantic models are requested as TMSL (the repository's model.bim layout) and
+reports as PBIR. In model.bim, fields the service maintains (refresh and
+modification timestamps, object state) are dropped, as are the partitions of
+tables with an incremental refresh policy: once refreshed, the service
+replaces the template partition with the policy's range partitions.
+
+The list-items response carries no modification time or etag, so every
+check downloads every definition in scope.
+
+Usage:
+    python deploy/check_drift.py                                  # TARGET_ENVIRONMENT / TARGET_WORKSPACE_ID
+    python deploy/check_drift.py --workspace QA=<guid> --workspace PROD=<guid>
+    python deploy/check_drift.py --standin --standin-drift 2      # against a local API stand-in
+
+Credentials are read as in deploy_workspace.py (<ENV>_CLIENT_ID etc.).
+
+Exit codes:
+  0 — every workspace matches the repository
+  1 — error, or drift detected
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.parse import urlparse
+from urllib.request import Request, urlopen
+
+import yaml
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S%z",
+    stream=sys.stdout,
+)
+logger = logging.getLogger("fabric-cicd-drift")
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+DEFAULT_REPO_DIR = "./workspace"
+DEFAULT_PARAMETER_FILE = "./config/parameter.yml"
+DEFAULT_ITEM_TYPES = ["Notebook", "SemanticModel", "Report", "Environment"]  # as deploy_workspace.py
+DEFAULT_MAX_WORKERS = 8
+
+FABRIC_API = "https://api.fabric.microsoft.com/v1"
+FABRIC_SCOPE = "https://api.fabric.microsoft.com/.default"
+MAX_THROTTLE_RETRIES = 5
+OPERATION_TIMEOUT_SECONDS = 300
+
+# getDefinition ?format= per item type, matching the layout under workspace/.
+DEFINITION_FORMATS = {"SemanticModel": "TMSL", "Report": "PBIR"}
+# model.bim fields set by the service on deployment and refresh, never in the repository.
+SERVICE_MANAGED_FIELDS = {
+    "createdTimestamp", "lastProcessed", "lastSchemaUpdate", "lastUpdate",
+    "modifiedTime", "refreshedTime", "state", "structureModifiedTime",
+}
+IGNORED_PARTS = {".platform"}
+JSON_SUFFIXES = {".json", ".pbir", ".pbism", ".bim", ".ipynb"}
+
+
+# ---------------------------------------------------------------------------
+# Normalization
+# ---------------------------------------------------------------------------
+
+def parameter_rules(path: str | Path, environment: str) -> dict[str, str]:
+    """``{repository value: deployed value}`` find_replace rules for one environment.
+
+    Accepts the environment-first layout used in config/parameter.yml as well
+    as fabric-cicd's value-first mapping and list layouts.
+    """
+    document = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    find_replace = document.get("find_replace") or {}
+    rules: dict[str, str] = {}
+    if isinstance(find_replace, list):
+        for rule in find_replace:
+            value = (rule.get("replace_value") or {}).get(environment)
+            if value is not None:
+                rules[str(rule["find_value"])] = str(value)
+    elif isinstance(find_replace.get(environment), dict):
+        rules = {str(k): str(v) for k, v in find_replace[environment].items()}
+    else:
+        for find, per_env in find_replace.items():
+            if isinstance(per_env, dict) and environment in per_env:
+                rules[str(find)] = str(per_env[environment])
+    return {k: v for k, v in rules.items() if k != v}
+
+
+def apply_rules(text: str, rules: dict[str, str]) -> str:
+    # Longest first, so a value that contains another is replaced whole.
+    for find in sorted(rules, key=len, reverse=True):
+        text = text.replace(find, rules[find])
+    return text
+
+
+def _strip_service_fields(node):
+    if isinstance(node, dict):
+        return {k: _strip_service_fields(v) for k, v in node.items() if k not in SERVICE_MANAGED_FIELDS}
+    if isinstance(node, list):
+        return [_strip_service_fields(v) for v in node]
+    return node
+
+
+def normalize_model(document: dict) -> dict:
+    """model.bim without what the service adds or rewrites after deployment."""
+    document = _strip_service_fields(document)
+    for table in (document.get("model") or {}).get("tables", []):
+        if table.get("refreshPolicy"):
+            # The policy holds the source query; its partitions belong to the service.
+            table.pop("partitions", None)
+    return document
+
+
+def normalize_part(path: str, content: bytes, reverse_rules: dict[str, str]) -> bytes:
+    """Canonical bytes for one definition part, with environment values mapped back to the repo's."""
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return content
+    text = apply_rules(text, reverse_rules)
+    if Path(path).suffix.lower() in JSON_SUFFIXES:
+        try:
+            document = json.loads(text)
+        except ValueError:
+            pass
+        else:
+            if path.endswith("definition.pbir") and isinstance(document, dict):
+                # fabric-cicd rebinds the report from byPath to the deployed model.
+                document.pop("datasetReference", None)
+            if path.endswith(".bim") and isinstance(document, dict):
+                document = normalize_model(document)
+            return json.dumps(document, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+    lines = text.replace("\r\n", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n").encode()
+
+
+def hash_parts(parts: dict[str, bytes], reverse_rules: dict[str, str]) -> dict[str, str]:
+    return {
+        path: hashlib.sha256(normalize_part(path, content, reverse_rules)).hexdigest()
+        for path, content in sorted(parts.items())
+        if Path(path).name not in IGNORED_PARTS
+    }
+
+
+def definition_hash(part_hashes: dict[str, str]) -> str:
+    return hashlib.sha256("\n".join(f"{p}:{h}" for p, h in sorted(part_hashes.items())).encode()).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Repository
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RepoItem:
+    item_type: str
+    name: str
+    description: str
+    parts: dict[str, bytes]
+    part_hashes: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.item_type, self.name
+
+
+def repository_items(repo_dir: str, item_types: list[str]) -> dict[tuple[str, str], RepoItem]:
+    items = {}
+    for platform in sorted(Path(repo_dir).glob("*/.platform")):
+        metadata = json.loads(platform.read_text(encoding="utf-8-sig")).get("metadata", {})
+        item_type = metadata.get("type") or platform.parent.suffix.lstrip(".")
+        if item_type not in item_types:
+            continue
+        parts = {
+            f.relative_to(platform.parent).as_posix(): f.read_bytes()
+            for f in sorted(platform.parent.rglob("*")) if f.is_file() and f.name not in IGNORED_PARTS
+        }
+        item = RepoItem(item_type, metadata.get("displayName") or platform.parent.stem,
+                        metadata.get("description", ""), parts)
+        item.part_hashes = hash_parts(parts, {})
+        items[item.key] = item
+    return items
+
+
+# ---------------------------------------------------------------------------
+# Fabric REST
+# ---------------------------------------------------------------------------
+
+class FabricClient:
+    """The few Fabric REST calls drift detection needs, with throttling and LRO handling."""
+
+    def __init__(self, base_url: str = FABRIC_API, credential=None):
+        self.base_url = base_url.rstrip("/")
+        self.credential = credential
+
+    def _call(self, method: str, url: str, body: dict | None = None) -> tuple[int, dict, dict]:
+        headers = {"Content-Type": "application/json"}
+        if self.credential is not None:
+            headers["Authorization"] = f"Bearer {self.credential.get_token(FABRIC_SCOPE).token}"
+        data = json.dumps(body).encode() if body is not None else None
+        for attempt in range(MAX_THROTTLE_RETRIES + 1):
+            try:
+                with urlopen(Request(url, data=data, method=method, headers=headers), timeout=60) as response:
+                    raw = response.read()
+                    return response.status, (json.loads(raw) if raw else {}), dict(response.headers)
+            except HTTPError as exc:
+                if exc.code != 429 or attempt == MAX_THROTTLE_RETRIES:
+                    raise RuntimeError(f"{method} {url} failed: HTTP {exc.code} {exc.read().decode(errors='replace')}") from exc
+                wait = int(exc.headers.get("Retry-After", 2 ** attempt))
+                logger.warning("Throttled by Fabric API, retrying in %ds…", wait)
+                time.sleep(wait)
+        raise AssertionError("unreachable")
+
+    def list_items(self, workspace_id: str) -> list[dict]:
+        items, url = [], f"{self.base_url}/workspaces/{workspace_id}/items"
+        while url:
+            _, page, _ = self._call("GET", url)
+            items.extend(page.get("value", []))
+            url = page.get("continuationUri")
+        return items
+
+    def get_definition(self, workspace_id: str, item_id: str, definition_format: str | None = None) -> dict[str, bytes]:
+        url = f"{self.base_url}/workspaces/{workspace_id}/items/{item_id}/getDefinition"
+        if definition_format:
+            url += f"?format={definition_format}"
+        status, result, headers = self._call("POST", url)
+        if status == 202:
+            location = headers.get("Location")
+            deadline = time.monotonic() + OPERATION_TIMEOUT_SECONDS
+            while True:
+                time.sleep(float(headers.get("Retry-After", 1)))
+                _, operation, headers = self._call("GET", location)
+                if operation.get("status") == "Succeeded":
+                    break
+                if operation.get("status") == "Failed" or time.monotonic() > deadline:
+                    raise RuntimeError(f"getDefinition for item {item_id} failed: {json.dumps(operation)}")
+            _, result, _ = self._call("GET", f"{location}/result")
+        return {
+            part["path"]: base64.b64decode(part["payload"])
+            for part in result.get("definition", {}).get("parts", [])
+        }
+
+
+# ---------------------------------------------------------------------------
+# Drift detection
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Target:
+    environment: str
+    workspace_id: str
+
+
+@dataclass
+class Drift:
+    environment: str
+    workspace_id: str
+    item_type: str
+    item_name: str
+    kind: str  # missing | unmanaged | metadata | definition
+    detail: str = ""
+
+
+def _compare_definition(repo: RepoItem, part_hashes: dict[str, str]) -> str | None:
+    if definition_hash(part_hashes) == definition_hash(repo.part_hashes):
+        return None
+    changed = sorted(
+        p for p in set(part_hashes) | set(repo.part_hashes) if part_hashes.get(p) != repo.part_hashes.get(p)
+    )
+    return "parts differ: " + ", ".join(changed)
+
+
+def check_drift(targets: list[Target], repo: dict[tuple[str, str], RepoItem], clients: dict[str, FabricClient],
+                parameter_file: str, max_workers: int = DEFAULT_MAX_WORKERS) -> tuple[list[Drift], dict]:
+    """Compare every target workspace with the repository; returns (drift, stats)."""
+    item_types = {t for t, _ in repo}
+    stats = {"items": 0, "downloaded": 0}
+    drift: list[Drift] = []
+    lock = threading.Lock()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        listings = list(pool.map(lambda t: clients[t.environment].list_items(t.workspace_id), targets))
+
+        downloads = []
+        for target, listing in zip(targets, listings):
+            reverse = {v: k for k, v in parameter_rules(parameter_file, target.environment).items()}
+            deployed = {(i["type"], i["displayName"]): i for i in listing if i.get("type") in item_types}
+            for key, item in repo.items():
+                if key not in deployed:
+                    drift.append(Drift(target.environment, target.workspace_id, *key, "missing"))
+            for key, item in deployed.items():
+                stats["items"] += 1
+                if key not in repo:
+                    drift.append(Drift(target.environment, target.workspace_id, *key, "unmanaged"))
+                    continue
+                if (item.get("description") or "") != repo[key].description:
+                    drift.append(Drift(target.environment, target.workspace_id, *key, "metadata",
+                                       "description differs"))
+                downloads.append((target, item, reverse))
+
+        def fetch(job):
+            target, item, reverse = job
+            parts = clients[target.environment].get_definition(target.workspace_id, item["id"],
+                                                               DEFINITION_FORMATS.get(item["type"]))
+            part_hashes = hash_parts(parts, reverse)
+            with lock:
+                stats["downloaded"] += 1
+            detail = _compare_definition(repo[(item["type"], item["displayName"])], part_hashes)
+            if detail:
+                return Drift(target.environment, target.workspace_id, item["type"], item["displayName"],
+                             "definition", detail)
+            return None
+
+        drift.extend(d for d in pool.map(fetch, downloads) if d)
+
+    return drift, stats
+
+
+# ---------------------------------------------------------------------------
+# Local API stand-in
+# ---------------------------------------------------------------------------
+
+def _deployed_part(content: bytes, rules: dict[str, str]) -> bytes:
+    try:
+        return apply_rules(content.decode("utf-8-sig"), rules).encode()
+    except UnicodeDecodeError:
+        return content
+
+
+def _refreshed_model(content: bytes) -> bytes:
+    """model.bim as getDefinition returns it after a refresh: policy range partitions, service timestamps."""
+    document = json.loads(content)
+    for table in document.get("model", {}).get("tables", []):
+        table["lastProcessed"] = "2026-01-02T06:00:00Z"
+        if table.get("refreshPolicy"):
+            table["partitions"] = [
+                {"name": str(year), "mode": "import", "state": "ready", "refreshedTime": "2026-01-02T06:00:00Z",
+                 "source": {"type": "policyRange", "start": f"{year}-01-01T00:00:00",
+                            "end": f"{year + 1}-01-01T00:00:00", "granularity": "year"}}
+                for year in (2024, 2025, 2026)
+            ]
+    document["model"]["structureModifiedTime"] = "2026-01-01T00:00:00Z"
+    return json.dumps(document, indent=4).encode()
+
+
+class FabricStandIn:
+    """Serves the list-items and getDefinition (LRO) endpoints for fake workspaces.
+
+    Each workspace is seeded from the repository with that environment's
+    find_replace rules applied, as fabric-cicd would deploy it, and semantic
+    models as the service returns them after a scheduled refresh.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.workspaces: dict[str, dict[str, dict]] = {}
+        self.operations: dict[str, dict] = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.base_url = ""
+        self.server: ThreadingHTTPServer | None = None
+
+    def deploy(self, workspace_id: str, repo: dict[tuple[str, str], RepoItem], rules: dict[str, str]) -> None:
+        items = {}
+        for (item_type, name), item in repo.items():
+            item_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{workspace_id}/{item_type}/{name}"))
+            parts = {p: _deployed_part(c, rules) for p, c in item.parts.items()}
+            if "model.bim" in parts:
+                parts["model.bim"] = _refreshed_model(parts["model.bim"])
+            items[item_id] = {"id": item_id, "type": item_type, "displayName": name, "description": item.description,
+                              "workspaceId": workspace_id, "parts": parts}
+        self.workspaces[workspace_id] = items
+
+    def edit(self, workspace_id: str, count: int) -> None:
+        """Simulate direct edits in the portal: change ``count`` items and add one unmanaged item."""
+        items = self.workspaces[workspace_id]
+        for item in sorted(items.values(), key=lambda i: i["displayName"])[:count]:
+            path = sorted(item["parts"])[0]
+            item["parts"][path] += b"\n-- edited in the portal\n"
+        item_id = str(uuid.uuid4())
+        items[item_id] = {"id": item_id, "type": "Notebook", "displayName": "Scratch_Notebook", "description": "",
+                          "workspaceId": workspace_id, "parts": {"notebook-content.py": b"# scratch"}}
+
+    def handle(self, method: str, path: str) -> tuple[int, dict, dict]:
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        segments = urlparse(path).path.strip("/").split("/")[1:]  # drop the v1 prefix
+        if method == "GET" and len(segments) == 3 and segments[0] == "workspaces" and segments[2] == "items":
+            items = self.workspaces.get(segments[1])
+            if items is None:
+                return 404, {"errorCode": "WorkspaceNotFound"}, {}
+            return 200, {"value": [{k: v for k, v in i.items() if k != "parts"} for i in items.values()]}, {}
+        if method == "POST" and len(segments) == 5 and segments[4] == "getDefinition":
+            item = self.workspaces.get(segments[1], {}).get(segments[3])
+            if item is None:
+                return 404, {"errorCode": "ItemNotFound"}, {}
+            operation_id = str(uuid.uuid4())
+            parts = [{"path": p, "payload": base64.b64encode(c).decode(), "payloadType": "InlineBase64"}
+                     for p, c in item["parts"].items()]
+            self.operations[operation_id] = {"definition": {"parts": parts}}
+            location = f"{self.base_url}/v1/operations/{operation_id}"
+            return 202, {}, {"Location": location, "Retry-After": "0"}
+        if method == "GET" and segments[:1] == ["operations"] and segments[1] in self.operations:
+            if len(segments) == 3 and segments[2] == "result":
+                return 200, self.operations.pop(segments[1]), {}
+            return 200, {"status": "Succeeded"}, {}
+        return 404, {"errorCode": "NotFound"}, {}
+
+    def start(self) -> str:
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, method: str) -> None:
+                status, payload, headers = standin.handle(method, self.path)
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                for name, value in {**headers, "Content-Type": "application/json"}.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):  # noqa: N802 — http.server naming
+                self._respond("GET")
+
+            def do_POST(self):  # noqa: N802 — http.server naming
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self._respond("POST")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        return f"{self.base_url}/v1"
+
+    def stop(self) -> None:
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+def _parse_targets(values: list[str]) -> list[Target]:
+    targets = []
+    for raw in values:
+        environment, _, workspace_id = raw.partition("=")
+        if not environment or not workspace_id:
+            raise ValueError(f"Invalid --workspace value '{raw}'. Expected ENV=WORKSPACE_ID.")
+        targets.append(Target(environment.upper(), workspace_id))
+    return targets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--workspace", action="append", default=[], metavar="ENV=WORKSPACE_ID",
+                        help="Workspace to check (repeatable; default TARGET_ENVIRONMENT=TARGET_WORKSPACE_ID)")
+    parser.add_argument("--repo-dir", default=os.environ.get("REPO_DIR", DEFAULT_REPO_DIR))
+    parser.add_argument("--parameter-file", default=DEFAULT_PARAMETER_FILE)
+    parser.add_argument("--items", default=os.environ.get("ITEMS_IN_SCOPE"),
+                        help="Comma-separated item types (default: ITEMS_IN_SCOPE or the deploy defaults)")
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS)
+    parser.add_argument("--api-url", default=FABRIC_API, help="Fabric REST base URL")
+    parser.add_argument("--standin", action="store_true", help="Check against a local Fabric API stand-in")
+    parser.add_argument("--standin-drift", type=int, default=0, help="Items edited in each stand-in workspace")
+    parser.add_argument("--standin-latency", type=float, default=0.05, help="Seconds per stand-in request")
+    parser.add_argument("--json-out", help="Write the drift report as JSON to this path")
+    args = parser.parse_args()
+
+    item_types = [t.strip() for t in args.items.split(",") if t.strip()] if args.items else DEFAULT_ITEM_TYPES
+    try:
+        targets = _parse_targets(args.workspace)
+        repo = repository_items(args.repo_dir, item_types)
+    except (OSError, ValueError) as exc:
+        logger.error("%s", exc)
+        sys.exit(1)
+
+    standin = None
+    if args.standin:
+        standin = FabricStandIn(args.standin_latency)
+        api_url = standin.start()
+        if not targets:
+            targets = [Target(env, str(uuid.uuid4())) for env in ("QA", "PROD")]
+        for target in targets:
+            standin.deploy(target.workspace_id, repo, parameter_rules(args.parameter_file, target.environment))
+            if args.standin_drift:
+                standin.edit(target.workspace_id, args.standin_drift)
+        clients = {t.environment: FabricClient(api_url) for t in targets}
+    else:
+        if not targets:
+            targets = [Target((os.environ.get("TARGET_ENVIRONMENT") or "").upper(),
+                              os.environ.get("TARGET_WORKSPACE_ID") or "")]
+            if not all([targets[0].environment, targets[0].workspace_id]):
+                logger.error("Pass --workspace ENV=ID or set TARGET_ENVIRONMENT and TARGET_WORKSPACE_ID.")
+                sys.exit(1)
+        from deploy_workspace import _build_credential
+
+        clients = {env: FabricClient(args.api_url, _build_credential(env)) for env in {t.environment for t in targets}}
+
+    start = time.monotonic()
+    try:
+        drift, stats = check_drift(targets, repo, clients, args.parameter_file, args.max_workers)
+    except Exception:
+        logger.exception("Drift check failed.")
+        sys.exit(1)
+    finally:
+        if standin:
+            standin.stop()
+    elapsed = time.monotonic() - start
+
+    logger.info(
+        "Checked %d item(s) in %d workspace(s) in %.2f seconds: %d definition(s) downloaded.",
+        stats["items"], len(targets), elapsed, stats["downloaded"],
+    )
+    for target in targets:
+        found = [d for d in drift if d.workspace_id == target.workspace_id]
+        if not found:
+            logger.info("%s %s: in sync with the repository.", target.environment, target.workspace_id)
+        for d in found:
+            logger.warning("%s %s: %s '%s' %s%s", d.environment, d.workspace_id, d.item_type, d.item_name, d.kind,
+                           f" ({d.detail})" if d.detail else "")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps([d.__dict__ for d in drift], indent=2), encoding="utf-8")
+    if drift:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
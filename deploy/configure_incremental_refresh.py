@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+configure_incremental_refresh.py — Add incremental refresh policies to model.bim.
+
+Fact tables in Sales_Report.SemanticModel import every row on every refresh.
+This tool gives each fact table a date-based refresh policy so the service
+keeps yearly/monthly/daily partitions and only reloads the most recent ones:
+
+  * partitions follow OrderDate, which never changes once an order exists.
+    A table with its own OrderDate is filtered on it; a child table (e.g.
+    SalesOrderDetail) is inner-joined to the parent its FK references and
+    filtered on the parent's OrderDate, so header and lines always land in the
+    same partitions. Mutable dates such as ModifiedDate are never used: an
+    updated row would move to a new partition and leave its old copy behind;
+  * the table's M partition is filtered on the RangeStart / RangeEnd
+    parameters (added to the model if missing) so the filter folds to SQL;
+  * when the table also has ModifiedDate, a polling expression is added so a
+    refresh skips incremental partitions whose MAX(ModifiedDate) is unchanged.
+
+By default every model table whose SQL source is transactional (has an
+OrderDate / DueDate / ShipDate, or an FK chain to such a table) is configured;
+tables that reach no OrderDate within one FK hop are skipped.
+
+Usage:
+    python deploy/configure_incremental_refresh.py
+    python deploy/configure_incremental_refresh.py --tables SalesOrderHeader,Customer
+    python deploy/configure_incremental_refresh.py --rolling-years 5 --incremental-days 30
+    python deploy/configure_incremental_refresh.py --check      # CI: fail if out of date
+
+Exit codes:
+  0 — model written (or up to date with --check)
+  1 — error, or model out of date with --check
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import sys
+from pathlib import Path
+
+from semantic_model import DEFAULT_MODEL_PATH, dumps_model, load_model, primary_source
+from sql_project import DEFAULT_PROJECT_DIR, ForeignKey, SqlProject, load_sql_project
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S%z",
+)
+logger = logging.getLogger("fabric-cicd-incremental-refresh")
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+PARTITION_DATE_COLUMN = "OrderDate"
+CHANGE_DETECTION_COLUMN = "ModifiedDate"
+TRANSACTIONAL_DATE_COLUMNS = {"OrderDate", "DueDate", "ShipDate"}
+
+DEFAULT_ROLLING_YEARS = 3
+DEFAULT_INCREMENTAL_DAYS = 10
+
+FILTER_STEP = '#"Filtered Rows"'
+PARENT_STEP = '#"Filtered Parent"'
+_NAVIGATION_RE = re.compile(r'=\s*(\w+)\{\[Schema="\w+",\s*Item="\w+"\]\}\[Data\]')
+RANGE_PARAMETERS = {
+    "RangeStart": "#datetime(2020, 1, 1, 0, 0, 0)",
+    "RangeEnd": "#datetime(2030, 1, 1, 0, 0, 0)",
+}
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _m_lines(expression: str | list[str]) -> list[str]:
+    return list(expression) if isinstance(expression, list) else expression.splitlines()
+
+
+def _range_parameter(name: str, default: str) -> dict:
+    return {
+        "name": name,
+        "kind": "m",
+        "expression": f'{default} meta [IsParameterQuery=true, Type="DateTime", IsParameterQueryRequired=true]',
+        "annotations": [{"name": "PBI_ResultType", "value": "DateTime"}],
+    }
+
+
+def ensure_range_parameters(model: dict) -> None:
+    """Add the RangeStart / RangeEnd M parameters incremental refresh filters on."""
+    expressions = model["model"].setdefault("expressions", [])
+    existing = {e["name"] for e in expressions}
+    for name, default in RANGE_PARAMETERS.items():
+        if name not in existing:
+            expressions.append(_range_parameter(name, default))
+
+
+def filter_expression(lines: list[str], column: str, via: ForeignKey | None = None) -> list[str]:
+    """Append a RangeStart/RangeEnd filter step to a ``let … in <step>`` M query.
+
+    With ``via``, ``column`` belongs to the FK's parent table: the rows are
+    inner-joined to the parent rows in range instead of filtered directly.
+    """
+    if any("RangeStart" in line for line in lines):
+        return lines
+    in_pos = max(i for i, line in enumerate(lines) if line.strip() == "in")
+    result_step = lines[in_pos + 1].strip()
+    body = lines[:in_pos]
+    body[-1] = body[-1].rstrip() + ","
+    if via is None:
+        body.append(
+            f"    {FILTER_STEP} = Table.SelectRows({result_step}, "
+            f"each [{column}] >= RangeStart and [{column}] < RangeEnd)"
+        )
+        return [*body, "in", f"    {FILTER_STEP}"]
+
+    source = next((m.group(1) for m in map(_NAVIGATION_RE.search, body) if m), None)
+    if source is None:
+        raise ValueError(f"Cannot find the database step to join {via.ref_table} from.")
+    schema, name = via.ref_table.split(".", 1)
+    parent_keys = ", ".join(f'"{c}"' for c in [*via.ref_columns, column])
+    body.append(
+        f"    {PARENT_STEP} = Table.SelectRows(Table.SelectColumns("
+        f'{source}{{[Schema="{schema}",Item="{name}"]}}[Data], {{{parent_keys}}}), '
+        f"each [{column}] >= RangeStart and [{column}] < RangeEnd),"
+    )
+    keys = ", ".join(f'"{c}"' for c in via.columns)
+    ref_keys = ", ".join(f'"{c}"' for c in via.ref_columns)
+    body.append(
+        f"    {FILTER_STEP} = Table.RemoveColumns(Table.NestedJoin({result_step}, {{{keys}}}, "
+        f'{PARENT_STEP}, {{{ref_keys}}}, "Parent", JoinKind.Inner), {{"Parent"}})'
+    )
+    return [*body, "in", f"    {FILTER_STEP}"]
+
+
+def polling_expression(filtered: list[str], column: str) -> list[str]:
+    """M query returning MAX(``column``) for the partition, used to skip unchanged partitions."""
+    in_pos = max(i for i, line in enumerate(filtered) if line.strip() == "in")
+    body = filtered[:in_pos]
+    body[-1] = body[-1].rstrip() + ","
+    return [
+        *body,
+        f"    #\"Max {column}\" = List.Max({FILTER_STEP}[{column}]),",
+        f"    accountForNull = if #\"Max {column}\" = null then #datetime(1901, 1, 1, 0, 0, 0) else #\"Max {column}\"",
+        "in",
+        "    accountForNull",
+    ]
+
+
+def partition_path(table: dict, project: SqlProject) -> tuple[str, ForeignKey | None] | None:
+    """Where the table's PARTITION_DATE_COLUMN comes from.
+
+    ``(column, None)`` when the SQL table has it and the model imports it,
+    ``(column, fk)`` when the parent referenced by ``fk`` has it, else None.
+    """
+    obj = primary_source(table)
+    sql_table = project.table(obj) if obj else None
+    if sql_table is None:
+        return None
+    model_columns = {c.get("sourceColumn", c["name"]) for c in table.get("columns", [])}
+    if sql_table.column(PARTITION_DATE_COLUMN):
+        return (PARTITION_DATE_COLUMN, None) if PARTITION_DATE_COLUMN in model_columns else None
+    for fk in sql_table.foreign_keys:
+        parent = project.table(fk.ref_table)
+        if parent and parent.column(PARTITION_DATE_COLUMN) and set(fk.columns) <= model_columns:
+            return PARTITION_DATE_COLUMN, fk
+    return None
+
+
+def apply_policy(table: dict, column: str, rolling_years: int, incremental_days: int,
+                 via: ForeignKey | None = None) -> None:
+    partitions = [p for p in table.get("partitions", []) if p.get("source", {}).get("type") == "m"]
+    if len(partitions) != 1:
+        raise ValueError(
+            f"Table '{table['name']}' must have exactly one M partition to add a refresh policy "
+            f"(found {len(partitions)})."
+        )
+    source = partitions[0]["source"]
+    filtered = filter_expression(_m_lines(source["expression"]), column, via)
+    source["expression"] = filtered
+
+    policy = {
+        "policyType": "basic",
+        "rollingWindowGranularity": "year",
+        "rollingWindowPeriods": rolling_years,
+        "incrementalGranularity": "day",
+        "incrementalPeriods": incremental_days,
+        "sourceExpression": filtered,
+    }
+    model_columns = {c.get("sourceColumn", c["name"]) for c in table.get("columns", [])}
+    if CHANGE_DETECTION_COLUMN in model_columns:
+        policy["pollingExpression"] = polling_expression(filtered, CHANGE_DETECTION_COLUMN)
+    table["refreshPolicy"] = policy
+
+
+def default_tables(model: dict, project: SqlProject) -> list[str]:
+    transactional = project.transactional_tables(TRANSACTIONAL_DATE_COLUMNS)
+    return [
+        t["name"] for t in model["model"].get("tables", [])
+        if primary_source(t) in transactional
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="model.bim to update")
+    parser.add_argument("--project-dir", default=DEFAULT_PROJECT_DIR, help="SQL project directory")
+    parser.add_argument("--tables", help="Comma-separated model tables (default: transactional tables)")
+    parser.add_argument("--rolling-years", type=int, default=DEFAULT_ROLLING_YEARS,
+                        help="Years of history kept in the model")
+    parser.add_argument("--incremental-days", type=int, default=DEFAULT_INCREMENTAL_DAYS,
+                        help="Trailing days reloaded on each refresh")
+    parser.add_argument("--check", action="store_true", help="Do not write; exit 1 if the model is out of date")
+    args = parser.parse_args()
+
+    model_path = Path(args.model)
+    try:
+        model = load_model(model_path)
+        project = load_sql_project(args.project_dir)
+    except (OSError, ValueError) as exc:
+        logger.error("%s", exc)
+        sys.exit(1)
+
+    wanted = [t.strip() for t in args.tables.split(",") if t.strip()] if args.tables else default_tables(model, project)
+    tables = {t["name"]: t for t in model["model"].get("tables", [])}
+    configured = 0
+    for name in wanted:
+        table = tables.get(name)
+        if table is None:
+            logger.error("Table '%s' not found in %s", name, model_path)
+            sys.exit(1)
+        path = partition_path(table, project)
+        if path is None:
+            logger.warning("Skipping %s: no %s on the table or an FK parent.", name, PARTITION_DATE_COLUMN)
+            continue
+        column, via = path
+        try:
+            apply_policy(table, column, args.rolling_years, args.incremental_days, via)
+        except ValueError as exc:
+            logger.error("%s", exc)
+            sys.exit(1)
+        configured += 1
+        logger.info(
+            "  %-20s partitioned on %-34s keep %d years, refresh last %d days%s",
+            name, f"{via.ref_table}.{column}" if via else column, args.rolling_years, args.incremental_days,
+            ", detect changes" if "pollingExpression" in table["refreshPolicy"] else "",
+        )
+    if configured:
+        ensure_range_parameters(model)
+
+    current = model_path.read_text(encoding="utf-8-sig")
+    rendered = dumps_model(model, current)
+    if args.check:
+        if current != rendered:
+            logger.error("%s is out of date. Run deploy/configure_incremental_refresh.py and commit.", model_path)
+            sys.exit(1)
+        logger.info("%s is up to date.", model_path)
+        return
+
+    model_path.write_text(rendered, encoding="utf-8")
+    logger.info("Configured incremental refresh on %d table(s) in %s", configured, model_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+deploy_history.py — Local SQLite history of deployments, and a CLI to query it.
+
+deploy_workspace.py records every run here: one row per run, one per published
+item-type batch and one per item, with durations, definition payload sizes,
+retries and outcomes. The deploy path reads it back to publish the slowest
+independent item types first, and the CLI reports p50/p95 trends.
+
+fabric-cicd publishes a whole item type per call, so per-item timings come from
+its "Publishing <Type> '<Name>'" log lines: an item's duration runs from its
+log line to the next one in the same batch (or the end of the batch).
+
+Usage:
+    python deploy/deploy_history.py runs [--environment QA] [--limit 20]
+    python deploy/deploy_history.py items RUN_ID
+    python deploy/deploy_history.py trends [--environment PROD] [--days 30] [--by item]
+
+The database is DEPLOY_HISTORY_DB (default .deploy-history/history.db).
+
+Exit codes:
+  0 — success
+  1 — error (e.g. database or run not found)
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger("fabric-cicd-history")
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+DEFAULT_HISTORY_DB = ".deploy-history/history.db"
+ESTIMATE_WINDOW = 10  # recent successful batches used for a duration estimate
+DEFAULT_TREND_DAYS = 30
+
+PUBLISH_RE = re.compile(r"Publishing (\w+) '(.+?)'")
+# fabric-cicd 0.1.2 re-sends a request after each of these: throttling and a
+# reserved item name back off ("<reason> Checking again in N seconds ..."), an
+# expired token is refreshed. "Operation in progress. Checking again ..." is the
+# normal polling of a long-running operation and is not counted.
+RETRY_RE = re.compile(r"API is throttled\. Checking again|Item name is reserved\. +Checking again|AAD token expired")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at    TEXT    NOT NULL,
+    finished_at   TEXT,
+    environment   TEXT    NOT NULL,
+    workspace_id  TEXT    NOT NULL,
+    git_commit    TEXT,
+    max_parallel  INTEGER NOT NULL DEFAULT 1,
+    duration_s    REAL,
+    outcome       TEXT    NOT NULL DEFAULT 'running',
+    error         TEXT
+);
+CREATE INDEX IF NOT EXISTS IX_runs_environment ON runs (environment, started_at);
+
+CREATE TABLE IF NOT EXISTS batches (
+    run_id        INTEGER NOT NULL REFERENCES runs (run_id),
+    item_type     TEXT    NOT NULL,
+    started_at    TEXT    NOT NULL,
+    item_count    INTEGER NOT NULL,
+    payload_bytes INTEGER NOT NULL,
+    duration_s    REAL    NOT NULL,
+    retries       INTEGER NOT NULL DEFAULT 0,
+    outcome       TEXT    NOT NULL,
+    PRIMARY KEY (run_id, item_type)
+);
+
+CREATE TABLE IF NOT EXISTS items (
+    run_id        INTEGER NOT NULL REFERENCES runs (run_id),
+    item_type     TEXT    NOT NULL,
+    item_name     TEXT    NOT NULL,
+    payload_bytes INTEGER NOT NULL,
+    duration_s    REAL,
+    retries       INTEGER NOT NULL DEFAULT 0,
+    outcome       TEXT    NOT NULL,
+    PRIMARY KEY (run_id, item_type, item_name)
+);
+"""
+
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ItemResult:
+    name: str
+    payload_bytes: int
+    duration_s: float | None = None
+    retries: int = 0
+    outcome: str = "succeeded"
+
+
+@dataclass
+class BatchResult:
+    item_type: str
+    started_at: str
+    payload_bytes: int = 0
+    duration_s: float = 0.0
+    retries: int = 0
+    outcome: str = "running"
+    items: list[ItemResult] = field(default_factory=list)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile (same method as numpy's default)."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+# ---------------------------------------------------------------------------
+# Per-item timing from fabric-cicd logs
+# ---------------------------------------------------------------------------
+
+class PublishTimer(logging.Handler):
+    """Turns fabric-cicd log lines into per-item timings for the batch running on each thread.
+
+    Attach it to the ``fabric_cicd`` logger and wrap each publish call in
+    :meth:`batch`; batches on different threads are timed independently.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(level=logging.DEBUG)
+        self._events: dict[int, list[tuple[float, str | None]]] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        events = self._events.get(record.thread)
+        if events is None:
+            return
+        message = record.getMessage()
+        match = PUBLISH_RE.search(message)
+        if match:
+            events.append((time.monotonic(), match.group(2)))
+        elif RETRY_RE.search(message):
+            events.append((time.monotonic(), None))
+
+    @contextmanager
+    def batch(self, item_type: str, payloads: dict[str, int]) -> Iterator[BatchResult]:
+        """Time one item-type publish; ``payloads`` maps item name to definition bytes."""
+        result = BatchResult(item_type, _now(), payload_bytes=sum(payloads.values()))
+        ident = threading.get_ident()
+        self._events[ident] = []
+        start = time.monotonic()
+        try:
+            yield result
+            result.outcome = "succeeded"
+        except BaseException:
+            result.outcome = "failed"
+            raise
+        finally:
+            end = time.monotonic()
+            result.duration_s = end - start
+            result.items, result.retries = _item_results(self._events.pop(ident), end, payloads, result.outcome)
+
+
+def _item_results(events: list[tuple[float, str | None]], end: float, payloads: dict[str, int],
+                  outcome: str) -> tuple[list[ItemResult], int]:
+    items: dict[str, ItemResult] = {}
+    current, started, retries = None, 0.0, 0
+    for at, name in events:
+        if name is None:
+            if current:
+                current.retries += 1
+            retries += 1
+            continue
+        if current:
+            current.duration_s = at - started
+        current = items.setdefault(name, ItemResult(name, payloads.get(name, 0)))
+        started = at
+    if current:
+        current.duration_s = end - started
+        current.outcome = outcome
+
+    for name, size in payloads.items():
+        if name not in items:
+            # Not seen in the logs: either never reached, or the log format changed.
+            items[name] = ItemResult(name, size, outcome="not published" if outcome == "failed" else outcome)
+    return sorted(items.values(), key=lambda i: i.name), retries
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class DeploymentHistory:
+    """SQLite-backed deployment history; safe to write from publish worker threads."""
+
+    def __init__(self, path: str | Path = DEFAULT_HISTORY_DB) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    # -- writes --------------------------------------------------------------
+
+    def start_run(self, environment: str, workspace_id: str, git_commit: str | None, max_parallel: int) -> int:
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "INSERT INTO runs (started_at, environment, workspace_id, git_commit, max_parallel) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (_now(), environment, workspace_id, git_commit, max_parallel),
+            )
+        return cursor.lastrowid
+
+    def record_batch(self, run_id: int, batch: BatchResult) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO batches VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, batch.item_type, batch.started_at, len(batch.items), batch.payload_bytes,
+                 batch.duration_s, batch.retries, batch.outcome),
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, batch.item_type, i.name, i.payload_bytes, i.duration_s, i.retries, i.outcome)
+                 for i in batch.items],
+            )
+
+    def finish_run(self, run_id: int, outcome: str, error: str | None = None) -> None:
+        with self._lock, self._db:
+            started = self._db.execute("SELECT started_at FROM runs WHERE run_id = ?", (run_id,)).fetchone()[0]
+            finished = datetime.now(timezone.utc)
+            self._db.execute(
+                "UPDATE runs SET finished_at = ?, duration_s = ?, outcome = ?, error = ? WHERE run_id = ?",
+                (finished.isoformat(timespec="milliseconds"),
+                 (finished - datetime.fromisoformat(started)).total_seconds(), outcome, error, run_id),
+            )
+
+    # -- reads ---------------------------------------------------------------
+
+    def estimated_durations(self, environment: str, window: int = ESTIMATE_WINDOW) -> dict[str, float]:
+        """Median of the last ``window`` successful batch durations per item type.
+
+        Falls back to other environments' history for item types never deployed to
+        ``environment``.
+        """
+        rows = self._db.execute(
+            "SELECT b.item_type, r.environment, b.duration_s FROM batches b JOIN runs r USING (run_id) "
+            "WHERE b.outcome = 'succeeded' ORDER BY b.started_at DESC"
+        ).fetchall()
+        local: dict[str, list[float]] = {}
+        anywhere: dict[str, list[float]] = {}
+        for row in rows:
+            for bucket in (anywhere, local) if row["environment"] == environment else (anywhere,):
+                durations = bucket.setdefault(row["item_type"], [])
+                if len(durations) < window:
+                    durations.append(row["duration_s"])
+        return {t: percentile(local.get(t) or d, 50) for t, d in anywhere.items()}
+
+    def last_deployed_commit(self, environment: str, workspace_id: str) -> str | None:
+        """Commit of the most recent successful run to this environment's workspace."""
+        row = self._db.execute(
+            "SELECT git_commit FROM runs WHERE environment = ? AND workspace_id = ? AND outcome = 'succeeded' "
+            "AND git_commit IS NOT NULL ORDER BY run_id DESC LIMIT 1",
+            (environment, workspace_id),
+        ).fetchone()
+        return row["git_commit"] if row else None
+
+    def runs(self, environment: str | None = None, limit: int = 20) -> list[sqlite3.Row]:
+        return self._db.execute(
+            "SELECT r.*, COUNT(i.item_name) AS item_count, COALESCE(SUM(i.retries), 0) AS retries "
+            "FROM runs r LEFT JOIN items i USING (run_id) "
+            "WHERE ? IS NULL OR r.environment = ? GROUP BY r.run_id ORDER BY r.run_id DESC LIMIT ?",
+            (environment, environment, limit),
+        ).fetchall()
+
+    def items(self, run_id: int) -> list[sqlite3.Row]:
+        return self._db.execute(
+            "SELECT i.*, b.duration_s AS batch_duration_s FROM items i JOIN batches b USING (run_id, item_type) "
+            "WHERE i.run_id = ? ORDER BY i.duration_s IS NULL, i.duration_s DESC",
+            (run_id,),
+        ).fetchall()
+
+    def trends(self, environment: str | None = None, days: int = DEFAULT_TREND_DAYS,
+               by: str = "type") -> list[dict]:
+        """p50/p95 per (environment, item type or item) over the last ``days``, vs the ``days`` before."""
+        now = datetime.now(timezone.utc)
+        current_since = (now - timedelta(days=days)).isoformat(timespec="seconds")
+        previous_since = (now - timedelta(days=2 * days)).isoformat(timespec="seconds")
+        if by == "item":
+            sql = ("SELECT r.environment, i.item_type || ' ' || i.item_name AS subject, i.duration_s, r.started_at "
+                   "FROM items i JOIN runs r USING (run_id) WHERE i.outcome = 'succeeded' AND i.duration_s IS NOT NULL")
+        else:
+            sql = ("SELECT r.environment, b.item_type AS subject, b.duration_s, r.started_at "
+                   "FROM batches b JOIN runs r USING (run_id) WHERE b.outcome = 'succeeded'")
+        sql += " AND r.started_at >= ? AND (? IS NULL OR r.environment = ?)"
+        current: dict[tuple[str, str], list[float]] = {}
+        previous: dict[tuple[str, str], list[float]] = {}
+        for row in self._db.execute(sql, (previous_since, environment, environment)):
+            bucket = current if row["started_at"] >= current_since else previous
+            bucket.setdefault((row["environment"], row["subject"]), []).append(row["duration_s"])
+
+        result = []
+        for (env, subject), durations in sorted(current.items()):
+            before = previous.get((env, subject))
+            p50 = percentile(durations, 50)
+            previous_p50 = percentile(before, 50) if before else None
+            result.append({
+                "environment": env,
+                "subject": subject,
+                "samples": len(durations),
+                "p50": p50,
+                "p95": percentile(durations, 95),
+                "previous_p50": previous_p50,
+                "change_pct": (p50 / previous_p50 - 1) * 100 if previous_p50 else None,
+            })
+        return result
+
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+def _fmt_seconds(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}s"
+
+
+def _fmt_bytes(value: int) -> str:
+    if value < 1024:
+        return f"{value}B"
+    if value < 1024 * 1024:
+        return f"{value / 1024:.1f}KB"
+    return f"{value / 1024 / 1024:.1f}MB"
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%dT%H:%M:%S%z",
+        stream=sys.stdout,
+    )
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--db", default=os.environ.get("DEPLOY_HISTORY_DB") or DEFAULT_HISTORY_DB,
+                        help="History database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runs_cmd = commands.add_parser("runs", help="List recent deployment runs")
+    runs_cmd.add_argument("--environment", type=str.upper)
+    runs_cmd.add_argument("--limit", type=int, default=20)
+
+    items_cmd = commands.add_parser("items", help="Per-item durations for one run, slowest first")
+    items_cmd.add_argument("run_id", type=int)
+
+    trends_cmd = commands.add_parser("trends", help="p50/p95 deploy time per item type (or item) and environment")
+    trends_cmd.add_argument("--environment", type=str.upper)
+    trends_cmd.add_argument("--days", type=int, default=DEFAULT_TREND_DAYS)
+    trends_cmd.add_argument("--by", choices=("type", "item"), default="type")
+    args = parser.parse_args()
+
+    if not Path(args.db).is_file():
+        logger.error("No deployment history at %s", args.db)
+        sys.exit(1)
+    history = DeploymentHistory(args.db)
+
+    if args.command == "runs":
+        print(f"{'RUN':>5}  {'STARTED':25}  {'ENV':5} {'COMMIT':8} {'ITEMS':>5} {'RETRIES':>7} {'DURATION':>9}  OUTCOME")
+        for row in history.runs(args.environment, args.limit):
+            print(f"{row['run_id']:>5}  {row['started_at']:25}  {row['environment']:5} "
+                  f"{(row['git_commit'] or '-')[:8]:8} {row['item_count']:>5} {row['retries']:>7} "
+                  f"{_fmt_seconds(row['duration_s']):>9}  {row['outcome']}")
+
+    elif args.command == "items":
+        rows = history.items(args.run_id)
+        if not rows:
+            logger.error("Run %d not found or has no recorded items.", args.run_id)
+            sys.exit(1)
+        print(f"{'TYPE':15} {'ITEM':35} {'PAYLOAD':>9} {'RETRIES':>7} {'DURATION':>9}  OUTCOME")
+        for row in rows:
+            print(f"{row['item_type']:15} {row['item_name'][:35]:35} {_fmt_bytes(row['payload_bytes']):>9} "
+                  f"{row['retries']:>7} {_fmt_seconds(row['duration_s']):>9}  {row['outcome']}")
+
+    else:
+        label = "ITEM" if args.by == "item" else "ITEM TYPE"
+        print(f"{'ENV':5} {label:40} {'N':>4} {'P50':>8} {'P95':>8} {'PREV P50':>9} {'CHANGE':>7}")
+        for row in history.trends(args.environment, args.days, args.by):
+            change = "-" if row["change_pct"] is None else f"{row['change_pct']:+.0f}%"
+            print(f"{row['environment']:5} {row['subject'][:40]:40} {row['samples']:>4} "
+                  f"{_fmt_seconds(row['p50']):>8} {_fmt_seconds(row['p95']):>8} "
+                  f"{_fmt_seconds(row['previous_p50']):>9} {change:>7}")
+
+    history.close()
+
+
+if __name__ == "__main__":
+    main()
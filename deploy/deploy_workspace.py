@@ -9,17 +9,29 @@ Usage:
     python deploy/deploy_workspace.py
 
 All configuration is read from environment variables (see .env.example).
+
+Item types are published in dependency order (e.g. SemanticModel before
+Report). Types with no dependency on each other are published concurrently,
+up to DEPLOY_MAX_PARALLEL at a time, slowest first according to the local
+deployment history (deploy_history.py), which every run also records into.
 """
 
 from __future__ import annotations
 
+import json
 import logging
+import math
 import os
+import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timezone
+from pathlib import Path
 
 from azure.identity import ClientSecretCredential
+from deploy_history import DEFAULT_HISTORY_DB, DeploymentHistory, PublishTimer
 from fabric_cicd import FabricWorkspace, publish_all_items, unpublish_all_orphan_items
+from refresh_semantic_model import refresh_changed_models
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -50,6 +62,16 @@ UPN_ONLY_ITEM_TYPES = [
 ]
 VALID_ENVIRONMENTS = {"DEV", "QA", "PROD"}
 
+# Item types whose definitions reference another type's deployed items; the
+# referenced types must be published first. Anything not listed is independent.
+ITEM_TYPE_DEPENDENCIES = {
+    "Notebook": {"Environment", "Lakehouse"},
+    "SemanticModel": {"Lakehouse", "Warehouse"},
+    "Report": {"SemanticModel"},
+    "DataPipeline": {"Notebook"},
+}
+DEFAULT_MAX_PARALLEL = 1
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -70,6 +92,20 @@ def _parse_bool(value: str | None) -> bool:
     return value.strip().lower() in ("true", "1", "yes")
 
 
+def _parse_positive_int(name: str, raw: str | None, default: int) -> int:
+    """Parse an optional positive integer setting, exiting on an invalid value."""
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 0
+    if value < 1:
+        logger.error("Invalid %s '%s'. Must be a positive integer.", name, raw)
+        sys.exit(1)
+    return value
+
+
 def _parse_items_in_scope(raw: str | None) -> list[str]:
     """Parse a comma-separated list of item types, falling back to defaults."""
     if not raw:
@@ -109,18 +145,128 @@ def _build_credential(environment: str) -> ClientSecretCredential:
     )
 
 
+def _git_commit(repo_dir: str) -> str | None:
+    """Commit being deployed: the CI-provided SHA, else the checkout's HEAD."""
+    sha = os.environ.get("GITHUB_SHA") or os.environ.get("BUILD_SOURCEVERSION")
+    if sha:
+        return sha
+    result = subprocess.run(["git", "-C", repo_dir, "rev-parse", "HEAD"], capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def _repository_items(repo_dir: str) -> dict[str, dict[str, int]]:
+    """``{item_type: {display_name: definition_bytes}}`` for every item folder in the repo."""
+    items: dict[str, dict[str, int]] = {}
+    for platform in sorted(Path(repo_dir).glob("*/.platform")):
+        metadata = json.loads(platform.read_text(encoding="utf-8-sig")).get("metadata", {})
+        item_type = metadata.get("type") or platform.parent.suffix.lstrip(".")
+        name = metadata.get("displayName") or platform.parent.stem
+        size = sum(f.stat().st_size for f in platform.parent.rglob("*") if f.is_file() and f.name != ".platform")
+        items.setdefault(item_type, {})[name] = size
+    return items
+
+
+def dependency_levels(item_types: list[str]) -> list[list[str]]:
+    """Group item types into levels; each level only depends on earlier ones."""
+    remaining = list(item_types)
+    levels: list[list[str]] = []
+    while remaining:
+        level = [t for t in remaining if not (ITEM_TYPE_DEPENDENCIES.get(t, set()) & set(remaining))]
+        if not level:  # a cycle: publish the rest in the configured order
+            level = remaining[:1]
+        levels.append(level)
+        remaining = [t for t in remaining if t not in level]
+    return levels
+
+
 # ---------------------------------------------------------------------------
 # Core deployment logic
 # ---------------------------------------------------------------------------
 
+def _publish_item_type(
+    workspace_id: str,
+    environment: str,
+    repo_dir: str,
+    item_type: str,
+    credential: ClientSecretCredential,
+    timer: PublishTimer,
+    payloads: dict[str, int],
+    history: DeploymentHistory | None,
+    run_id: int | None,
+) -> None:
+    workspace = FabricWorkspace(
+        workspace_id=workspace_id,
+        environment=environment,
+        repository_directory=repo_dir,
+        item_type_in_scope=[item_type],
+        token_credential=credential,
+    )
+    logger.info("Publishing %d %s item(s)…", len(payloads), item_type)
+    try:
+        with timer.batch(item_type, payloads) as batch:
+            publish_all_items(workspace)
+    finally:
+        if history is not None:
+            history.record_batch(run_id, batch)
+    logger.info("Published %s in %.1f seconds.", item_type, batch.duration_s)
+
+
+def publish_in_order(
+    workspace_id: str,
+    environment: str,
+    repo_dir: str,
+    item_types: list[str],
+    credential: ClientSecretCredential,
+    max_parallel: int,
+    history: DeploymentHistory | None = None,
+    run_id: int | None = None,
+) -> None:
+    """Publish item types level by level, longest-running first within a level."""
+    repo_items = _repository_items(repo_dir)
+    estimates = history.estimated_durations(environment) if history else {}
+    timer = PublishTimer()
+    fabric_logger = logging.getLogger("fabric_cicd")
+    fabric_logger.addHandler(timer)
+    try:
+        for level in dependency_levels([t for t in item_types if repo_items.get(t)]):
+            # Types with no history sort first: they may well be the slowest.
+            ordered = sorted(level, key=lambda t: estimates.get(t, math.inf), reverse=True)
+            logger.info(
+                "Publishing %s (estimated %s).", ", ".join(ordered),
+                ", ".join(f"{t}={estimates[t]:.0f}s" if t in estimates else f"{t}=unknown" for t in ordered),
+            )
+            with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+                futures = [
+                    pool.submit(_publish_item_type, workspace_id, environment, repo_dir, t,
+                                credential, timer, repo_items[t], history, run_id)
+                    for t in ordered
+                ]
+                wait(futures)
+            for future in futures:
+                future.result()  # re-raise the first failure before the next level
+    finally:
+        fabric_logger.removeHandler(timer)
+
+
 def deploy(
     workspace_id: str,
     environment: str,
     repo_dir: str,
     item_types: list[str],
     clean_orphans: bool,
+    refresh_models: bool = False,
+    base_ref: str | None = None,
+    max_parallel: int = DEFAULT_MAX_PARALLEL,
+    history: DeploymentHistory | None = None,
 ) -> None:
-    """Run a full deterministic deployment to the target workspace."""
+    """Run a full deterministic deployment to the target workspace.
+
+    ``base_ref`` is the commit the workspace was last deployed from; when None it
+    is looked up in ``history``, and without either every model table is refreshed.
+    """
+    git_commit = _git_commit(repo_dir)
+    if base_ref is None and history is not None:
+        base_ref = history.last_deployed_commit(environment, workspace_id)
 
     logger.info("=" * 60)
     logger.info("DEPLOYMENT START")
@@ -129,31 +275,47 @@ def deploy(
     logger.info("  Repo directory: %s", os.path.abspath(repo_dir))
     logger.info("  Item types    : %s", ", ".join(item_types))
     logger.info("  Clean orphans : %s", clean_orphans)
-    logger.info("  Git commit    : %s", os.environ.get("GITHUB_SHA", "local"))
+    logger.info("  Refresh models: %s", refresh_models)
+    logger.info("  Max parallel  : %d", max_parallel)
+    logger.info("  Git commit    : %s", git_commit or "unknown")
+    logger.info("  Last deployed : %s", base_ref or "unknown")
     logger.info("=" * 60)
 
     credential = _build_credential(environment)
+    run_id = history.start_run(environment, workspace_id, git_commit, max_parallel) if history else None
 
-    # Build FabricWorkspace object
-    workspace = FabricWorkspace(
-        workspace_id=workspace_id,
-        environment=environment,
-        repository_directory=repo_dir,
-        item_type_in_scope=item_types,
-        token_credential=credential,
-    )
-
-    # Publish all items
-    logger.info("Publishing items…")
-    publish_all_items(workspace)
-    logger.info("Publish completed successfully.")
-
-    # Optionally remove orphaned items
-    if clean_orphans:
-        logger.info("Removing orphaned items not present in repository…")
-        unpublish_all_orphan_items(workspace)
-        logger.info("Orphan cleanup completed successfully.")
-
+    try:
+        # Publish all items
+        logger.info("Publishing items…")
+        publish_in_order(workspace_id, environment, repo_dir, item_types, credential,
+                         max_parallel, history, run_id)
+        logger.info("Publish completed successfully.")
+
+        # Optionally remove orphaned items
+        if clean_orphans:
+            logger.info("Removing orphaned items not present in repository…")
+            workspace = FabricWorkspace(
+                workspace_id=workspace_id,
+                environment=environment,
+                repository_directory=repo_dir,
+                item_type_in_scope=item_types,
+                token_credential=credential,
+            )
+            unpublish_all_orphan_items(workspace)
+            logger.info("Orphan cleanup completed successfully.")
+
+        # Optionally refresh only the semantic model tables this deploy changed
+        if refresh_models and "SemanticModel" in item_types:
+            logger.info("Refreshing semantic model tables changed since %s…", base_ref or "(unknown: all tables)")
+            refresh_changed_models(credential, workspace_id, repo_dir, base_ref)
+            logger.info("Semantic model refresh completed successfully.")
+    except Exception as exc:
+        if history:
+            history.finish_run(run_id, "failed", str(exc))
+        raise
+
+    if history:
+        history.finish_run(run_id, "succeeded")
     logger.info("DEPLOYMENT FINISHED SUCCESSFULLY.")
 
 
@@ -178,6 +340,13 @@ def main() -> None:
     repo_dir = _env("REPO_DIR", required=False, default=DEFAULT_REPO_DIR)
     items_in_scope = _parse_items_in_scope(_env("ITEMS_IN_SCOPE", required=False))
     clean_orphans = _parse_bool(_env("CLEAN_ORPHANS", required=False, default="false"))
+    refresh_models = _parse_bool(_env("REFRESH_SEMANTIC_MODELS", required=False, default="false"))
+    base_ref = _env("DEPLOY_BASE_REF", required=False) or None
+    max_parallel = _parse_positive_int(
+        "DEPLOY_MAX_PARALLEL", _env("DEPLOY_MAX_PARALLEL", required=False), DEFAULT_MAX_PARALLEL,
+    )
+    history_db = _env("DEPLOY_HISTORY_DB", required=False, default=DEFAULT_HISTORY_DB)
+    history = DeploymentHistory(history_db) if history_db else None
 
     try:
         deploy(
@@ -186,11 +355,17 @@ def main() -> None:
             repo_dir=repo_dir,
             item_types=items_in_scope,
             clean_orphans=clean_orphans,
+            refresh_models=refresh_models,
+            base_ref=base_ref,
+            max_parallel=max_parallel,
+            history=history,
         )
     except Exception:
         logger.exception("Deployment failed.")
         sys.exit(1)
     finally:
+        if history:
+            history.close()
         end = datetime.now(timezone.utc)
         elapsed = (end - start).total_seconds()
         logger.info("Total elapsed time: %.1f seconds", elapsed)
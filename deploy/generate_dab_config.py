@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+generate_dab_config.py — Generate a performance-tuned Data API builder config.
+
+Reads the SalesLT table and view DDL from the FSI_DB_01 SQL project and
+(re)writes dab-config.json with:
+
+  * one entity per table/view already in the config, keeping its name,
+    description, GraphQL types and permissions so API routes and access don't
+    change. Tables and views not yet exposed are only added with --add-new,
+    and then read-only for the ``authenticated`` role: widening the API
+    surface is a deliberate, reviewed change;
+  * runtime pagination limits, so list endpoints never return unbounded result
+    sets, and key-fields for views so DAB can page with a keyset seek on the
+    view's unique clustered index instead of a scan + sort;
+  * a per-entity response cache TTL chosen from how volatile the table is
+    (reference / master / transactional);
+  * a read projection that excludes credential, replication and large-object
+    columns (PasswordHash, rowguid, VARBINARY(MAX), ...).
+
+Usage:
+    python deploy/generate_dab_config.py                 # rewrite dab-config.json
+    python deploy/generate_dab_config.py --check         # CI: fail if out of date
+    python deploy/generate_dab_config.py --ttl Customers=30 --max-page-size 500
+    python deploy/generate_dab_config.py --add-new       # also expose new tables/views (read-only)
+
+Exit codes:
+  0 — config written (or up to date with --check)
+  1 — error, or config out of date with --check
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from sql_project import DEFAULT_PROJECT_DIR, SqlProject, Table, View, load_sql_project
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S%z",
+)
+logger = logging.getLogger("fabric-cicd-dab-config")
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+DEFAULT_CONFIG_PATH = "./dab-config.json"
+DEFAULT_SCHEMA = "SalesLT"
+DAB_SCHEMA_URL = "https://github.com/Azure/data-api-builder/releases/download/v1.7.86/dab.draft.schema.json"
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Response cache TTL (seconds) per volatility tier.
+CACHE_TTL_SECONDS = {
+    "reference": 300,       # lookup tables with a unique Name (categories, models, products)
+    "master": 60,           # customers, addresses, descriptions, views
+    "transactional": 5,     # orders and anything hanging off them
+}
+TRANSACTIONAL_DATE_COLUMNS = {"OrderDate", "DueDate", "ShipDate"}
+
+# Never returned by read operations: credentials and replication GUIDs.
+# Large-object columns (VARCHAR(MAX), VARBINARY(MAX), ...) are excluded too.
+EXCLUDED_READ_COLUMNS = {"PasswordHash", "PasswordSalt", "rowguid"}
+CRUD_ACTIONS = ["create", "read", "update", "delete"]
+
+# Permissions for entities added with --add-new; widen them by hand if needed.
+NEW_ENTITY_PERMISSIONS = [{"role": "authenticated", "actions": [{"action": "read"}]}]
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _pluralize(name: str) -> str:
+    if name.endswith(("s", "x", "ch", "sh")):
+        return f"{name}es"
+    if name.endswith("y") and name[-2:-1].lower() not in "aeiou":
+        return f"{name[:-1]}ies"
+    return f"{name}s"
+
+
+def _humanize(name: str) -> str:
+    """``ProductModelProductDescription`` -> ``product model product description``."""
+    words, current = [], ""
+    for ch in name:
+        if ch.isupper() and current and not current[-1].isupper():
+            words.append(current)
+            current = ch
+        else:
+            current += ch
+    words.append(current)
+    return " ".join(w.lower() for w in words if w)
+
+
+def _parse_ttl_overrides(values: list[str]) -> dict[str, int]:
+    overrides = {}
+    for raw in values:
+        name, _, seconds = raw.partition("=")
+        if not name or not seconds.isdigit():
+            raise ValueError(f"Invalid --ttl value '{raw}'. Expected ENTITY=SECONDS.")
+        overrides[name.strip()] = int(seconds)
+    return overrides
+
+
+def cache_tier(obj: Table | View, transactional: set[str]) -> str:
+    if isinstance(obj, View):
+        return "master"
+    if obj.full_name in transactional:
+        return "transactional"
+    has_unique_name = any(ix.unique and ix.columns == ["Name"] for ix in obj.indexes)
+    return "reference" if has_unique_name else "master"
+
+
+def excluded_read_columns(obj: Table | View) -> list[str]:
+    if isinstance(obj, View):
+        return []
+    return sorted(
+        c.name for c in obj.columns
+        if c.name in EXCLUDED_READ_COLUMNS or c.is_large_object
+    )
+
+
+def view_key_fields(view: View) -> list[str]:
+    """Key columns DAB should page on: the view's unique index, else its *ID columns."""
+    unique = next((ix for ix in view.indexes if ix.unique), None)
+    if unique:
+        return list(unique.columns)
+    keys = [c for c in view.columns if c.endswith("ID")]
+    if keys:
+        logger.warning(
+            "View %s has no unique index; paging on %s requires a sort on every request.",
+            view.full_name, ", ".join(keys),
+        )
+    else:
+        logger.warning("View %s has no unique index or *ID column; DAB cannot page it.", view.full_name)
+    return keys
+
+
+def _read_fields(fields: dict | None, exclude: list[str]) -> dict:
+    """Merge the excluded columns into a read action's ``fields``, keeping its ``include`` list."""
+    if not fields:
+        return {"include": ["*"], "exclude": exclude}
+    current = list(fields.get("exclude") or [])
+    return {**fields, "include": fields.get("include") or ["*"],
+            "exclude": current + [c for c in exclude if c not in current]}
+
+
+def _project_permissions(permissions: list[dict], exclude: list[str]) -> list[dict]:
+    """Attach the read projection to every role, expanding ``*`` into explicit actions.
+
+    A read action that already has ``fields`` keeps them; the excluded columns
+    are added to its ``exclude`` list.
+    """
+    projected = []
+    for permission in permissions:
+        actions = []
+        for action in permission.get("actions", []):
+            name = action if isinstance(action, str) else action.get("action")
+            expanded = CRUD_ACTIONS if name == "*" and exclude else [name]
+            for item in expanded:
+                entry = {"action": item}
+                if isinstance(action, dict):
+                    entry.update({k: v for k, v in action.items() if k not in ("action", "fields")})
+                if item == "read" and exclude:
+                    entry["fields"] = _read_fields(action.get("fields") if isinstance(action, dict) else None, exclude)
+                elif isinstance(action, dict) and "fields" in action:
+                    entry["fields"] = action["fields"]
+                actions.append(entry)
+        projected.append({**permission, "actions": actions})
+    return projected
+
+
+def build_entity(obj: Table | View, existing: dict | None, ttl: int) -> dict:
+    """Build one DAB entity definition, preserving hand-set fields from ``existing``."""
+    existing = existing or {}
+    is_view = isinstance(obj, View)
+
+    source = {"object": obj.full_name, "type": "view" if is_view else "table"}
+    if is_view:
+        source["key-fields"] = view_key_fields(obj)
+
+    graphql = existing.get("graphql") or {
+        "enabled": True,
+        "type": {"singular": obj.name, "plural": _pluralize(obj.name)},
+    }
+    permissions = _project_permissions(
+        existing.get("permissions") or NEW_ENTITY_PERMISSIONS,
+        excluded_read_columns(obj),
+    )
+
+    label = _humanize(obj.name[1:]) + " view" if is_view and obj.name[:1] == "v" and obj.name[1:2].isupper() else _humanize(obj.name)
+    return {
+        "description": existing.get("description") or f"{label.capitalize()} records.",
+        "source": source,
+        "graphql": graphql,
+        "rest": existing.get("rest") or {"enabled": True},
+        "permissions": permissions,
+        "cache": {"enabled": True, "ttl-seconds": ttl},
+    }
+
+
+def build_config(
+    project: SqlProject,
+    existing: dict,
+    default_page_size: int = DEFAULT_PAGE_SIZE,
+    max_page_size: int = MAX_PAGE_SIZE,
+    ttl_overrides: dict[str, int] | None = None,
+    add_new: bool = False,
+) -> dict:
+    """Return a complete dab-config document for the entities in ``existing``.
+
+    With ``add_new``, tables and views in ``project`` without an entity are added too.
+    """
+    ttl_overrides = ttl_overrides or {}
+    by_source = {
+        entity.get("source", {}).get("object", "").lower(): (name, entity)
+        for name, entity in existing.get("entities", {}).items()
+    }
+    transactional = project.transactional_tables(TRANSACTIONAL_DATE_COLUMNS)
+
+    entities = {}
+    skipped = []
+    for obj in [*project.tables.values(), *project.views.values()]:
+        name, current = by_source.get(obj.full_name.lower(), (obj.name, None))
+        if current is None and not add_new:
+            skipped.append(obj.full_name)
+            continue
+        ttl = ttl_overrides.get(name, CACHE_TTL_SECONDS[cache_tier(obj, transactional)])
+        entities[name] = build_entity(obj, current, ttl)
+
+    if skipped:
+        logger.info("Not exposed (pass --add-new to add read-only entities): %s", ", ".join(skipped))
+
+    runtime = dict(existing.get("runtime", {}))
+    runtime["pagination"] = {
+        "default-page-size": default_page_size,
+        "max-page-size": max_page_size,
+    }
+    runtime["cache"] = {"enabled": True, "ttl-seconds": CACHE_TTL_SECONDS["master"]}
+
+    return {
+        "$schema": existing.get("$schema", DAB_SCHEMA_URL),
+        "data-source": existing.get("data-source", {
+            "database-type": "mssql",
+            "connection-string": "@env('MSSQL_CONNECTION_STRING')",
+        }),
+        "runtime": runtime,
+        "entities": entities,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--project-dir", default=DEFAULT_PROJECT_DIR, help="SQL project directory")
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH, help="dab-config.json to update")
+    parser.add_argument("--schema", default=DEFAULT_SCHEMA, help="Schema to expose (default: SalesLT)")
+    parser.add_argument("--default-page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--max-page-size", type=int, default=MAX_PAGE_SIZE)
+    parser.add_argument("--ttl", action="append", default=[], metavar="ENTITY=SECONDS",
+                        help="Override the cache TTL for one entity (repeatable)")
+    parser.add_argument("--add-new", action="store_true",
+                        help="Add entities for tables/views not in the config (read-only, authenticated role)")
+    parser.add_argument("--check", action="store_true", help="Do not write; exit 1 if the config is out of date")
+    args = parser.parse_args()
+
+    config_path = Path(args.config)
+    try:
+        ttl_overrides = _parse_ttl_overrides(args.ttl)
+        project = load_sql_project(args.project_dir, schemas={args.schema})
+        existing = json.loads(config_path.read_text(encoding="utf-8")) if config_path.is_file() else {}
+    except (OSError, ValueError) as exc:
+        logger.error("%s", exc)
+        sys.exit(1)
+
+    config = build_config(
+        project,
+        existing,
+        default_page_size=args.default_page_size,
+        max_page_size=args.max_page_size,
+        ttl_overrides=ttl_overrides,
+        add_new=args.add_new,
+    )
+    rendered = json.dumps(config, indent=2) + "\n"
+
+    for name, entity in config["entities"].items():
+        logger.info("  %-32s %-5s ttl=%ss", name, entity["source"]["type"], entity["cache"]["ttl-seconds"])
+
+    if args.check:
+        current = config_path.read_text(encoding="utf-8") if config_path.is_file() else ""
+        if current != rendered:
+            logger.error("%s is out of date. Run deploy/generate_dab_config.py and commit the result.", config_path)
+            sys.exit(1)
+        logger.info("%s is up to date.", config_path)
+        return
+
+    config_path.write_text(rendered, encoding="utf-8")
+    logger.info("Wrote %d entities to %s", len(config["entities"]), config_path)
+
+
+if __name__ == "__main__":
+    main()
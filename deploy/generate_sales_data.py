@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+"""
+generate_sales_data.py — Synthetic SalesLT data for load-testing, at any scale.
+
+Generates ProductCategory, Product, Customer, Address, CustomerAddress,
+SalesOrderHeader and SalesOrderDetail with NumPy, column-for-column against
+the DDL in the SQL project, and writes each table as numbered part files:
+
+  * every foreign key resolves (orders → customers and their addresses,
+    order lines → orders and products, products → leaf categories);
+  * CHECK constraints and unique keys hold (DueDate/ShipDate after OrderDate,
+    non-negative money, unique product names and numbers);
+  * revenue is skewed: customers have log-normal spend propensity and product
+    popularity is Zipf-like, so a minority of customers and products carry most
+    of the revenue. Order dates trend upward with yearly seasonality;
+  * reseller (offline) orders buy in volume and get the SpecialOffer volume
+    discounts from data/SpecialOffer.csv.
+
+Orders are generated and written in chunks of --chunk-size, each from its own
+seeded random stream, so memory stays flat and output is reproducible.
+
+Usage:
+    python deploy/generate_sales_data.py --orders 5000000 --customers 500000
+    python deploy/generate_sales_data.py --format csv --out data/generated   # bcp -c format
+    python deploy/generate_sales_data.py --start 2023-01-01 --end 2025-12-31 --seed 7
+    python deploy/generate_sales_data.py --empty-target                     # number every table from 1
+
+Output: <out>/<Table>/part-00000.parquet (or .csv: tab-separated, no header,
+like data/SpecialOffer.csv). Identity columns are included; load with
+IDENTITY_INSERT / bcp -E (KEEPIDENTITY).
+
+By default the data loads next to the AdventureWorksLT sample: every table's
+IDs start after the sample's highest ID and category names carry a
+" (generated)" suffix, so no primary or unique key collides. --empty-target
+numbers every table from 1 and keeps the plain category names, for a SalesLT
+schema without the sample. Either way, the DBCC CHECKIDENT reseeds and the
+SalesLT.SalesOrderNumber sequence restart to run after loading are logged.
+
+Exit codes:
+  0 — data written
+  1 — error
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import binascii
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from sql_project import DEFAULT_PROJECT_DIR, SqlProject, Table, load_sql_project
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S%z",
+)
+logger = logging.getLogger("fabric-cicd-generate-data")
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+DEFAULT_OUT_DIR = "./data/generated"
+DEFAULT_CUSTOMERS = 10_000
+DEFAULT_ORDERS = 100_000
+DEFAULT_PRODUCTS = 300
+DEFAULT_CHUNK_SIZE = 250_000  # orders per part file
+DEFAULT_START = "2022-01-01"
+DEFAULT_END = "2025-12-31"
+
+# Highest ID per table in the AdventureWorksLT sample data; generated IDs start after them.
+SAMPLE_MAX_IDS = {
+    "ProductCategory": 41,
+    "Product": 999,
+    "Customer": 30118,
+    "Address": 11382,
+    "SalesOrderHeader": 71946,
+    "SalesOrderDetail": 113732,
+}
+SAMPLE_CATEGORY_SUFFIX = " (generated)"  # AK_ProductCategory_Name: the sample uses the plain names
+# Tables whose IDs come from an IDENTITY column, and the sequence behind SalesOrderID.
+IDENTITY_TABLES = ["ProductCategory", "Product", "Customer", "Address", "SalesOrderDetail"]
+SALES_ORDER_SEQUENCE = "SalesLT.SalesOrderNumber"
+ANNUAL_GROWTH = 0.25
+SEASONALITY = 0.3  # peak-to-mean amplitude, peaking in late November
+SHIPPING_ADDRESS_SHARE = 0.3
+ONLINE_ORDER_SHARE = 0.7
+TAX_RATE = 0.08
+FREIGHT_RATE = 0.025
+
+# (parent, median list price, leaf categories) — the AdventureWorks hierarchy.
+CATEGORIES = [
+    ("Bikes", 1500.0, ["Mountain Bikes", "Road Bikes", "Touring Bikes"]),
+    ("Components", 250.0, ["Handlebars", "Bottom Brackets", "Brakes", "Chains", "Cranksets", "Derailleurs",
+                           "Forks", "Headsets", "Mountain Frames", "Pedals", "Road Frames", "Saddles",
+                           "Touring Frames", "Wheels"]),
+    ("Clothing", 45.0, ["Bib-Shorts", "Caps", "Gloves", "Jerseys", "Shorts", "Socks", "Tights", "Vests"]),
+    ("Accessories", 25.0, ["Bike Racks", "Bike Stands", "Bottles and Cages", "Cleaners", "Fenders", "Helmets",
+                           "Hydration Packs", "Lights", "Locks", "Panniers", "Pumps", "Tires and Tubes"]),
+]
+# Volume discount tiers from data/SpecialOffer.csv: (minimum quantity, discount).
+VOLUME_DISCOUNTS = [(11, 0.02), (15, 0.05), (25, 0.10), (41, 0.15), (61, 0.20)]
+
+FIRST_NAMES = np.array(["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David",
+                        "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah",
+                        "Charles", "Karen", "Wei", "Priya", "Carlos", "Aisha", "Kenji", "Olga", "Mateo", "Fatima"])
+LAST_NAMES = np.array(["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+                       "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson",
+                       "Martin", "Lee", "Chen", "Patel", "Nguyen", "Kim", "Okafor", "Ivanova", "Silva", "Haddad"])
+COMPANY_WORDS = np.array(["Metro", "Alpine", "Coastal", "Summit", "Urban", "Trail", "Velocity", "Pioneer", "Harbor",
+                          "Eagle", "Granite", "Riverside", "Northern", "Golden", "Prairie", "Canyon"])
+COMPANY_KINDS = np.array(["Cycles", "Bike Shop", "Sports", "Outfitters", "Wheels", "Sporting Goods", "Bikes",
+                          "Cycle Supply", "Gear", "Rentals"])
+SALES_PEOPLE = np.array([f"adventure-works\\{n}" for n in ("jillian0", "shu0", "linda3", "jae0", "jose1",
+                                                             "david8", "garrett1", "pamela0", "michael9")])
+STREETS = np.array(["Main St", "Oak Ave", "Pine St", "Maple Dr", "Cedar Ln", "Elm St", "Lakeview Rd", "Hill St",
+                    "Park Blvd", "Sunset Way", "River Rd", "Market St", "Broadway", "2nd Ave", "Industrial Pkwy"])
+# (city, state/province, country/region, postal code prefix)
+CITIES = [("Seattle", "Washington", "United States", "981"), ("Portland", "Oregon", "United States", "972"),
+          ("San Francisco", "California", "United States", "941"), ("Denver", "Colorado", "United States", "802"),
+          ("Austin", "Texas", "United States", "787"), ("Chicago", "Illinois", "United States", "606"),
+          ("Boston", "Massachusetts", "United States", "021"), ("Toronto", "Ontario", "Canada", "M5V"),
+          ("Vancouver", "British Columbia", "Canada", "V6B"), ("London", "England", "United Kingdom", "EC1"),
+          ("Manchester", "England", "United Kingdom", "M1 "), ("Berlin", "Berlin", "Germany", "101"),
+          ("Paris", "Ile-de-France", "France", "750"), ("Sydney", "New South Wales", "Australia", "200")]
+COLORS = np.array(["Black", "Red", "Silver", "Blue", "Yellow", "White", "Multi", "Grey"])
+SIZES = np.array(["S", "M", "L", "XL", "44", "48", "52", "58", "62"])
+SHIP_METHODS = np.array(["CARGO TRANSPORT 5", "OVERNIGHT J-FAST", "ZY - EXPRESS"])
+
+
+# ---------------------------------------------------------------------------
+# Vectorized helpers
+# ---------------------------------------------------------------------------
+
+def _rng(seed: int, *stream: int) -> np.random.Generator:
+    return np.random.default_rng([seed, *stream])
+
+
+def _strings(*parts) -> pa.Array:
+    """Element-wise concatenation of string arrays / scalars."""
+    arrays = [p if isinstance(p, str) else pa.array(p) if isinstance(p, np.ndarray) else p for p in parts]
+    arrays = [pc.cast(a, pa.string()) if isinstance(a, pa.Array) else a for a in arrays]
+    return pc.binary_join_element_wise(*arrays, "")
+
+
+def _zero_pad(values: np.ndarray, width: int) -> pa.Array:
+    return pc.utf8_lpad(pc.cast(pa.array(values), pa.string()), width, padding="0")
+
+
+def _uuids(rng: np.random.Generator, n: int) -> pa.Array:
+    """Random version-4 UUID strings without a Python-level loop."""
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    hexed = np.frombuffer(binascii.hexlify(raw.tobytes()), dtype=np.uint8).reshape(n, 32)
+    dash = np.full((n, 1), ord("-"), dtype=np.uint8)
+    text = np.hstack([hexed[:, :8], dash, hexed[:, 8:12], dash, hexed[:, 12:16], dash,
+                      hexed[:, 16:20], dash, hexed[:, 20:]])
+    return pc.utf8_upper(pc.cast(pa.array(np.ascontiguousarray(text).view("S36").ravel()), pa.string()))
+
+
+def _base64(rng: np.random.Generator, n: int, nbytes: int) -> pa.Array:
+    """Random base64 strings; ``nbytes`` is a multiple of 3 so rows encode independently."""
+    raw = rng.integers(0, 256, size=n * nbytes, dtype=np.uint8).tobytes()
+    encoded = np.frombuffer(base64.b64encode(raw), dtype=f"S{nbytes // 3 * 4}")
+    return pc.cast(pa.array(encoded), pa.string())
+
+
+def _nullable(values, mask: np.ndarray) -> pa.Array:
+    array = values if isinstance(values, pa.Array) else pa.array(values)
+    return pc.if_else(pa.array(mask), pa.nulls(len(array), array.type), array)
+
+
+def _money(values: np.ndarray) -> np.ndarray:
+    return np.round(values, 2)
+
+
+def _dates(start: np.datetime64, days: np.ndarray, rng: np.random.Generator | None = None) -> np.ndarray:
+    stamps = start + days.astype("timedelta64[D]")
+    if rng is not None:  # spread over business hours
+        stamps = stamps + rng.integers(8 * 3600, 20 * 3600, len(days)).astype("timedelta64[s]")
+    return stamps.astype("datetime64[ms]")
+
+
+def _skewed_weights(rng: np.random.Generator, n: int, sigma: float) -> np.ndarray:
+    weights = rng.lognormal(0.0, sigma, n)
+    return weights / weights.sum()
+
+
+def _zipf_weights(rng: np.random.Generator, n: int, exponent: float = 1.1) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    weights = weights[rng.permutation(n)]  # popularity is independent of ID
+    return weights / weights.sum()
+
+
+def _sql_type(sql_type: str) -> pa.DataType:
+    base = sql_type.split("(", 1)[0].strip().upper()
+    if base in ("DECIMAL", "NUMERIC"):
+        precision, scale = (int(x) for x in sql_type.split("(", 1)[1].rstrip(")").split(","))
+        return pa.decimal128(precision, scale)
+    return {
+        "INT": pa.int32(), "SMALLINT": pa.int16(), "TINYINT": pa.uint8(), "BIGINT": pa.int64(), "BIT": pa.bool_(),
+        "MONEY": pa.decimal128(19, 4), "SMALLMONEY": pa.decimal128(10, 4), "DATETIME": pa.timestamp("ms"),
+        "DATE": pa.date32(), "VARBINARY": pa.binary(),
+    }.get(base, pa.string())
+
+
+def to_table(ddl: Table, columns: dict) -> pa.Table:
+    """Arrange generated columns in DDL order and types; nullable columns not generated are NULL."""
+    unknown = set(columns) - {c.name for c in ddl.columns}
+    if unknown:
+        raise ValueError(f"{ddl.full_name} has no column(s) {', '.join(sorted(unknown))}")
+    arrays, n = {}, len(next(iter(columns.values())))
+    for column in ddl.columns:
+        target = _sql_type(column.sql_type)
+        if column.name in columns:
+            value = columns[column.name]
+            array = value if isinstance(value, pa.Array) else pa.array(value)
+            arrays[column.name] = array.cast(target)
+        elif column.nullable:
+            arrays[column.name] = pa.nulls(n, target)
+        else:
+            raise ValueError(f"{ddl.full_name}.{column.name} is NOT NULL but has no generator")
+    return pa.table(arrays)
+
+
+# ---------------------------------------------------------------------------
+# Generators
+# ---------------------------------------------------------------------------
+
+class SalesDataGenerator:
+    """Generates SalesLT tables chunk by chunk; every chunk is a pyarrow Table in DDL column order."""
+
+    def __init__(self, project: SqlProject, customers: int, products: int, orders: int,
+                 start: str, end: str, seed: int, empty_target: bool = False):
+        self.project = project
+        # Internally every table is numbered from 1; IDs are shifted by these offsets on output.
+        self.id_offsets = {table: 0 if empty_target else last for table, last in SAMPLE_MAX_IDS.items()}
+        self.category_suffix = "" if empty_target else SAMPLE_CATEGORY_SUFFIX
+        self.n_customers, self.n_products, self.n_orders = customers, products, orders
+        self.start, self.end = np.datetime64(start, "D"), np.datetime64(end, "D")
+        if self.end <= self.start:
+            raise ValueError("--end must be after --start")
+        self.seed = seed
+        self.now = np.datetime64(end, "ms") + np.timedelta64(1, "D")
+
+        rng = _rng(seed, 0)
+        self.customer_weights = _skewed_weights(rng, customers, sigma=1.2)
+        self.has_shipping = rng.random(customers) < SHIPPING_ADDRESS_SHARE
+        # Main office address of customer i is i + 1; shipping addresses follow, in customer order.
+        self.shipping_address = np.where(self.has_shipping, customers + np.cumsum(self.has_shipping), 0)
+        self.addresses = customers + int(self.has_shipping.sum())
+
+        self._categories()
+        self.product_category = self.leaf_ids[rng.integers(0, len(self.leaf_ids), products)]
+        parent_price = self.category_price[self.product_category]
+        self.list_price = _money(parent_price * rng.lognormal(0.0, 0.5, products))
+        self.product_weights = _zipf_weights(rng, products)
+
+        span = int((self.end - self.start).astype(int)) + 1
+        t = np.arange(span) / 365.25
+        day_weights = (1 + ANNUAL_GROWTH) ** t * (1 + SEASONALITY * np.cos(2 * np.pi * (t - 0.9)))
+        self.day_weights = day_weights / day_weights.sum()
+
+    def _categories(self) -> None:
+        names, parents, prices = [], [], {}
+        for parent_index, (parent, price, _) in enumerate(CATEGORIES, 1):
+            names.append(parent)
+            parents.append(0)
+            prices[parent_index] = price
+        for parent_index, (_, price, leaves) in enumerate(CATEGORIES, 1):
+            for leaf in leaves:
+                names.append(leaf)
+                parents.append(parent_index)
+                prices[len(names)] = price
+        self.category_names = np.array(names)
+        self.category_parents = np.array(parents)
+        self.leaf_ids = np.flatnonzero(self.category_parents) + 1
+        self.category_price = np.zeros(len(names) + 1)
+        for category_id, price in prices.items():
+            self.category_price[category_id] = price
+
+    def _id(self, table: str, ids):
+        return ids + self.id_offsets[table]
+
+    def last_ids(self, rows: dict[str, int]) -> dict[str, int]:
+        """Highest ID written per table, given the row counts written."""
+        return {table: self.id_offsets[table] + rows[table] for table in SAMPLE_MAX_IDS if rows.get(table)}
+
+    def _table(self, name: str) -> Table:
+        table = self.project.table(f"SalesLT.{name}")
+        if table is None:
+            raise ValueError(f"SalesLT.{name} not found in the SQL project")
+        return table
+
+    def product_categories(self) -> pa.Table:
+        rng, n = _rng(self.seed, 1), len(self.category_names)
+        return to_table(self._table("ProductCategory"), {
+            "ProductCategoryID": self._id("ProductCategory", np.arange(1, n + 1)),
+            "ParentProductCategoryID": _nullable(self._id("ProductCategory", self.category_parents),
+                                                 self.category_parents == 0),
+            "Name": _strings(self.category_names, self.category_suffix),
+            "rowguid": _uuids(rng, n),
+            "ModifiedDate": np.full(n, self.start.astype("datetime64[ms]")),
+        })
+
+    def products(self) -> pa.Table:
+        rng, n = _rng(self.seed, 2), self.n_products
+        ids = self._id("Product", np.arange(1, n + 1))
+        colors = COLORS[rng.integers(0, len(COLORS), n)]
+        sizes = SIZES[rng.integers(0, len(SIZES), n)]
+        no_size = rng.random(n) < 0.4
+        category = self.category_names[self.product_category - 1]
+        sell_start = _dates(self.start, rng.integers(-365, 30, n))
+        discontinued = rng.random(n) < 0.1
+        sell_end = sell_start + rng.integers(180, 1500, n).astype("timedelta64[D]")
+        code = np.char.upper(np.char.replace(np.char.ljust(category, 2).astype("U2"), " ", "X"))
+        return to_table(self._table("Product"), {
+            "ProductID": ids,
+            "Name": _strings(category, " ", _zero_pad(ids, 4), ", ", colors),
+            "ProductNumber": _strings(code, "-", _zero_pad(ids, 4), pc.if_else(pa.array(no_size), "", "-"),
+                                      pc.if_else(pa.array(no_size), "", pa.array(sizes))),
+            "Color": colors,
+            "StandardCost": _money(self.list_price * rng.uniform(0.45, 0.65, n)),
+            "ListPrice": self.list_price,
+            "Size": _nullable(sizes, no_size),
+            "Weight": _nullable(np.round(rng.uniform(0.1, 15.0, n), 2), rng.random(n) < 0.5),
+            "ProductCategoryID": self._id("ProductCategory", self.product_category),
+            "SellStartDate": sell_start,
+            "SellEndDate": _nullable(sell_end, ~discontinued),
+            "ThumbnailPhotoFileName": np.full(n, "no_image_available_small.gif"),
+            "rowguid": _uuids(rng, n),
+            "ModifiedDate": sell_start,
+        })
+
+    def customers_chunk(self, first: int, count: int, chunk: int) -> pa.Table:
+        rng = _rng(self.seed, 3, chunk)
+        ids = self._id("Customer", np.arange(first, first + count))
+        first_names = FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), count)]
+        last_names = LAST_NAMES[rng.integers(0, len(LAST_NAMES), count)]
+        company = _strings(COMPANY_WORDS[rng.integers(0, len(COMPANY_WORDS), count)], " ",
+                           COMPANY_KINDS[rng.integers(0, len(COMPANY_KINDS), count)])
+        return to_table(self._table("Customer"), {
+            "CustomerID": ids,
+            "NameStyle": np.zeros(count, dtype=bool),
+            "Title": _nullable(np.array(["Mr.", "Ms.", "Mrs.", "Dr."])[rng.integers(0, 4, count)],
+                               rng.random(count) < 0.3),
+            "FirstName": first_names,
+            "MiddleName": _nullable(np.array(list("ABCDEFGHJKLMNPRSTW"))[rng.integers(0, 18, count)],
+                                    rng.random(count) < 0.6),
+            "LastName": last_names,
+            "CompanyName": company,
+            "SalesPerson": SALES_PEOPLE[rng.integers(0, len(SALES_PEOPLE), count)],
+            "EmailAddress": pc.utf8_lower(_strings(first_names, ".", last_names, ids.astype(str), "@example.com")),
+            "Phone": _strings(_zero_pad(rng.integers(200, 1000, count), 3), "-555-",
+                              _zero_pad(rng.integers(0, 10_000, count), 4)),
+            "PasswordHash": _base64(rng, count, 33),
+            "PasswordSalt": _base64(rng, count, 6),
+            "rowguid": _uuids(rng, count),
+            "ModifiedDate": _dates(self.start, rng.integers(-730, 0, count)),
+        })
+
+    def addresses_chunk(self, first: int, count: int, chunk: int) -> tuple[pa.Table, pa.Table]:
+        """Address rows ``first``…, plus the CustomerAddress rows linking them to customers."""
+        rng = _rng(self.seed, 4, chunk)
+        ids = np.arange(first, first + count)
+        city = rng.integers(0, len(CITIES), count)
+        cities = np.array([c[0] for c in CITIES])[city]
+        modified = _dates(self.start, rng.integers(-730, 0, count))
+        address = to_table(self._table("Address"), {
+            "AddressID": self._id("Address", ids),
+            "AddressLine1": _strings(rng.integers(1, 20_000, count).astype(str), " ",
+                                     STREETS[rng.integers(0, len(STREETS), count)]),
+            "AddressLine2": _nullable(_strings("Suite ", rng.integers(100, 999, count).astype(str)),
+                                      rng.random(count) < 0.85),
+            "City": cities,
+            "StateProvince": np.array([c[1] for c in CITIES])[city],
+            "CountryRegion": np.array([c[2] for c in CITIES])[city],
+            "PostalCode": _strings(np.array([c[3] for c in CITIES])[city], _zero_pad(rng.integers(0, 100, count), 2)),
+            "rowguid": _uuids(rng, count),
+            "ModifiedDate": modified,
+        })
+
+        main = ids <= self.n_customers
+        shipping_owner = np.flatnonzero(self.has_shipping)  # customer index per shipping address
+        customer = np.where(main, ids, 0)
+        customer[~main] = shipping_owner[ids[~main] - self.n_customers - 1] + 1
+        link = to_table(self._table("CustomerAddress"), {
+            "CustomerID": self._id("Customer", customer),
+            "AddressID": self._id("Address", ids),
+            "AddressType": np.where(main, "Main Office", "Shipping"),
+            "rowguid": _uuids(rng, count),
+            "ModifiedDate": modified,
+        })
+        return address, link
+
+    def orders_chunk(self, first: int, count: int, first_detail: int, chunk: int) -> tuple[pa.Table, pa.Table]:
+        """``count`` orders starting at order index ``first`` and their lines."""
+        rng = _rng(self.seed, 5, chunk)
+        order_ids = self._id("SalesOrderHeader", np.arange(first + 1, first + count + 1))
+        customer = rng.choice(self.n_customers, size=count, p=self.customer_weights)
+        online = rng.random(count) < ONLINE_ORDER_SHARE
+        day = rng.choice(len(self.day_weights), size=count, p=self.day_weights)
+        order_date = _dates(self.start, day)
+        in_progress = order_date > self.now - np.timedelta64(8, "D")
+
+        # Order lines: online baskets are small, reseller orders are larger and buy in volume.
+        lines = np.where(online, rng.geometric(0.6, count), rng.geometric(0.2, count)).clip(1, 40)
+        order_of_line = np.repeat(np.arange(count), lines)
+        n_lines = len(order_of_line)
+        line_online = online[order_of_line]
+        product = rng.choice(self.n_products, size=n_lines, p=self.product_weights)
+        qty = np.where(line_online, rng.geometric(0.7, n_lines), rng.geometric(0.06, n_lines)).clip(1, 200)
+        discount = np.zeros(n_lines)
+        for minimum, rate in VOLUME_DISCOUNTS:
+            discount[qty >= minimum] = rate
+        unit_price = self.list_price[product]
+        line_total = qty * unit_price * (1 - discount)
+        subtotal = _money(np.bincount(order_of_line, weights=line_total, minlength=count))
+
+        ship_to = np.where(self.has_shipping[customer], self.shipping_address[customer], customer + 1)
+        header = to_table(self._table("SalesOrderHeader"), {
+            "SalesOrderID": order_ids,
+            "RevisionNumber": np.full(count, 2),
+            "OrderDate": order_date,
+            "DueDate": order_date + np.timedelta64(12, "D"),
+            "ShipDate": _nullable(order_date + np.timedelta64(7, "D"), in_progress),
+            "Status": np.where(in_progress, 1, 5),
+            "OnlineOrderFlag": online,
+            "PurchaseOrderNumber": _nullable(_strings("PO", _zero_pad(rng.integers(0, 10**10, count), 10)), online),
+            "AccountNumber": _strings("10-4020-", _zero_pad(self._id("Customer", customer + 1), 6)),
+            "CustomerID": self._id("Customer", customer + 1),
+            "ShipToAddressID": self._id("Address", ship_to),
+            "BillToAddressID": self._id("Address", customer + 1),
+            "ShipMethod": SHIP_METHODS[np.where(online, 0, rng.integers(0, len(SHIP_METHODS), count))],
+            "SubTotal": subtotal,
+            "TaxAmt": _money(subtotal * TAX_RATE),
+            "Freight": _money(subtotal * FREIGHT_RATE),
+            "rowguid": _uuids(rng, count),
+            "ModifiedDate": order_date + np.timedelta64(7, "D"),
+        })
+        detail = to_table(self._table("SalesOrderDetail"), {
+            "SalesOrderID": order_ids[order_of_line],
+            "SalesOrderDetailID": self._id("SalesOrderDetail", np.arange(first_detail, first_detail + n_lines)),
+            "OrderQty": qty,
+            "ProductID": self._id("Product", product + 1),
+            "UnitPrice": unit_price,
+            "UnitPriceDiscount": discount,
+            "rowguid": _uuids(rng, n_lines),
+            "ModifiedDate": order_date[order_of_line] + np.timedelta64(7, "D"),
+        })
+        return header, detail
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+class PartWriter:
+    def __init__(self, out_dir: str | Path, fmt: str):
+        self.out_dir, self.fmt = Path(out_dir), fmt
+        self.rows: dict[str, int] = {}
+        self.parts: dict[str, int] = {}
+
+    def write(self, name: str, table: pa.Table) -> None:
+        part = self.parts.get(name, 0)
+        path = self.out_dir / name / f"part-{part:05d}.{self.fmt}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.fmt == "parquet":
+            pq.write_table(table, path, compression="snappy")
+        else:
+            # bcp -c reads BIT as 0/1 and does not strip quotes.
+            table = pa.table({
+                c: table[c].cast(pa.int8()) if table[c].type == pa.bool_() else table[c] for c in table.column_names
+            })
+            options = pa_csv.WriteOptions(include_header=False, delimiter="\t", quoting_style="none")
+            pa_csv.write_csv(table, path, options)
+        self.parts[name] = part + 1
+        self.rows[name] = self.rows.get(name, 0) + table.num_rows
+
+
+def _chunks(total: int, size: int):
+    for chunk, first in enumerate(range(0, total, size)):
+        yield chunk, first, min(size, total - first)
+
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR, help="Output directory")
+    parser.add_argument("--format", choices=("parquet", "csv"), default="parquet")
+    parser.add_argument("--customers", type=int, default=DEFAULT_CUSTOMERS)
+    parser.add_argument("--products", type=int, default=DEFAULT_PRODUCTS)
+    parser.add_argument("--orders", type=int, default=DEFAULT_ORDERS)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Customers or orders per part file")
+    parser.add_argument("--start", default=DEFAULT_START, help="First order date (YYYY-MM-DD)")
+    parser.add_argument("--end", default=DEFAULT_END, help="Last order date (YYYY-MM-DD)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--empty-target", action="store_true",
+                        help="Number every table from 1 (SalesLT without the AdventureWorksLT sample)")
+    parser.add_argument("--project-dir", default=DEFAULT_PROJECT_DIR, help="SQL project directory")
+    args = parser.parse_args()
+
+    try:
+        if min(args.customers, args.products, args.orders, args.chunk_size) < 1:
+            raise ValueError("--customers, --products, --orders and --chunk-size must be positive")
+        project = load_sql_project(args.project_dir)
+        generator = SalesDataGenerator(project, args.customers, args.products, args.orders,
+                                       args.start, args.end, args.seed, args.empty_target)
+    except (OSError, ValueError) as exc:
+        logger.error("%s", exc)
+        sys.exit(1)
+
+    start = time.monotonic()
+    writer = PartWriter(args.out, args.format)
+    try:
+        writer.write("ProductCategory", generator.product_categories())
+        writer.write("Product", generator.products())
+        for chunk, first, count in _chunks(args.customers, args.chunk_size):
+            writer.write("Customer", generator.customers_chunk(first + 1, count, chunk))
+        for chunk, first, count in _chunks(generator.addresses, args.chunk_size):
+            address, link = generator.addresses_chunk(first + 1, count, chunk)
+            writer.write("Address", address)
+            writer.write("CustomerAddress", link)
+        next_detail = 1
+        for chunk, first, count in _chunks(args.orders, args.chunk_size):
+            header, detail = generator.orders_chunk(first, count, next_detail, chunk)
+            writer.write("SalesOrderHeader", header)
+            writer.write("SalesOrderDetail", detail)
+            next_detail += detail.num_rows
+            logger.info("  orders %d–%d written", first + 1, first + count)
+    except (OSError, ValueError, pa.ArrowException) as exc:
+        logger.error("%s", exc)
+        sys.exit(1)
+
+    elapsed = time.monotonic() - start
+    total = sum(writer.rows.values())
+    for name, rows in writer.rows.items():
+        logger.info("  %-18s %12s rows in %d part(s)", name, f"{rows:,}", writer.parts[name])
+    logger.info("Wrote %s rows to %s in %.1f seconds (%s rows/s).", f"{total:,}", args.out, elapsed,
+                f"{total / elapsed:,.0f}")
+    last_ids = generator.last_ids(writer.rows)
+    logger.info("After loading, reseed the identity columns and the SalesOrderID sequence:")
+    for table in IDENTITY_TABLES:
+        logger.info("  DBCC CHECKIDENT ('SalesLT.%s', RESEED, %d);", table, last_ids[table])
+    logger.info("  ALTER SEQUENCE %s RESTART WITH %d;", SALES_ORDER_SEQUENCE, last_ids["SalesOrderHeader"] + 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+refresh_semantic_model.py — Post-deploy refresh of only what the deploy touched.
+
+Compares each semantic model in the repository with its version at the commit
+last deployed to the target workspace and asks the Power BI enhanced refresh
+API to process just the affected tables:
+
+  * tables whose columns, partitions or refresh policy changed, and tables
+    whose SQL source (workspace/FSI_DB_01.SQLDatabase/*/Tables/*.sql) changed,
+    get a data refresh — tables with an incremental refresh policy only reload
+    their incremental window (applyRefreshPolicy);
+  * relationship-only changes get a recalculation, no data load, and
+    measure-only changes need no processing at all;
+  * connection changes (dataSources, M parameters, config/parameter.yml), or no
+    known last-deployed commit, fall back to refreshing every table.
+
+The last-deployed commit is DEPLOY_BASE_REF when set, otherwise the commit of
+the latest successful run to the same environment and workspace in the
+deployment history (deploy_history.py). It is never guessed from the Git
+history: a QA or PROD job held at an approval gate may be several pushes
+behind, and HEAD~1 would miss the tables changed in between.
+
+Called from deploy_workspace.py when REFRESH_SEMANTIC_MODELS=true, or run
+directly after a deployment (same environment variables as deploy_workspace.py):
+
+    python deploy/refresh_semantic_model.py --dry-run     # print the plan only
+    python deploy/refresh_semantic_model.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from deploy_history import DEFAULT_HISTORY_DB, DeploymentHistory
+from semantic_model import tables_by_source
+
+logger = logging.getLogger("fabric-cicd-refresh")
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+DEFAULT_REPO_DIR = "./workspace"
+POWER_BI_API = "https://api.powerbi.com/v1.0/myorg"
+POWER_BI_SCOPE = "https://analysis.windows.net/powerbi/api/.default"
+PARAMETER_FILE = "config/parameter.yml"
+
+POLL_INTERVAL_SECONDS = 15
+REFRESH_TIMEOUT_SECONDS = 3600
+MAX_THROTTLE_RETRIES = 5
+IN_PROGRESS_STATUSES = {"Unknown", "NotStarted", "InProgress"}
+
+# Model-level properties whose change invalidates data in every table. The
+# incremental refresh range parameters are set by the service on each refresh.
+CONNECTION_KEYS = ("dataSources", "expressions")
+RANGE_PARAMETERS = {"RangeStart", "RangeEnd"}
+
+
+# ---------------------------------------------------------------------------
+# Change detection
+# ---------------------------------------------------------------------------
+
+def _git(repo_root: Path, *args: str) -> str | None:
+    result = subprocess.run(["git", "-C", str(repo_root), *args], capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def _strip_measures(table: dict) -> dict:
+    return {k: v for k, v in table.items() if k != "measures"}
+
+
+def _connection_state(model: dict) -> list:
+    state = []
+    for key in CONNECTION_KEYS:
+        items = model["model"].get(key, [])
+        state.append([i for i in items if i.get("name") not in RANGE_PARAMETERS])
+    return state
+
+
+def last_deployed_commit(environment: str, workspace_id: str, history_db: str | None) -> str | None:
+    """Commit the workspace was last successfully deployed from, per the deployment history."""
+    if not history_db or not Path(history_db).is_file():
+        return None
+    history = DeploymentHistory(history_db)
+    try:
+        return history.last_deployed_commit(environment, workspace_id)
+    finally:
+        history.close()
+
+
+def plan_refresh(model_dir: Path, base_ref: str | None) -> dict:
+    """Return ``{"tables": [...], "calculate": bool, "reason": str}`` for one semantic model."""
+    model_path = model_dir / "model.bim"
+    model = json.loads(model_path.read_text(encoding="utf-8-sig"))
+    all_tables = [t["name"] for t in model["model"].get("tables", [])]
+    everything = {"tables": all_tables, "calculate": False}
+    if not base_ref:
+        return {**everything, "reason": "no previously deployed commit recorded"}
+
+    top = _git(model_dir, "rev-parse", "--show-toplevel")
+    if top is None or _git(model_dir, "rev-parse", "--verify", "--quiet", f"{base_ref}^{{commit}}") is None:
+        return {**everything, "reason": f"base ref {base_ref} unavailable"}
+    repo_root = Path(top.strip())
+    rel = model_path.resolve().relative_to(repo_root.resolve()).as_posix()
+
+    changed_files = (_git(repo_root, "diff", "--name-only", base_ref, "HEAD") or "").split()
+    if PARAMETER_FILE in changed_files:
+        return {**everything, "reason": f"{PARAMETER_FILE} changed"}
+
+    old_text = _git(repo_root, "show", f"{base_ref}:{rel}")
+    if old_text is None:
+        return {**everything, "reason": "model is new"}
+    old = json.loads(old_text.lstrip("\ufeff"))
+    if _connection_state(old) != _connection_state(model):
+        return {**everything, "reason": "connection or parameters changed"}
+
+    old_tables = {t["name"]: t for t in old["model"].get("tables", [])}
+    calculate = old["model"].get("relationships") != model["model"].get("relationships")
+    data = set()
+    for table in model["model"].get("tables", []):
+        before = old_tables.get(table["name"])
+        # Measures are evaluated at query time, so measure edits need no processing.
+        if before is None or _strip_measures(before) != _strip_measures(table):
+            data.add(table["name"])
+
+    sources = tables_by_source(model)
+    for path in changed_files:
+        parts = Path(path).parts
+        if len(parts) >= 3 and parts[-2] == "Tables" and path.endswith(".sql") and ".SQLDatabase" in path:
+            name = sources.get(f"{parts[-3]}.{Path(path).stem}")
+            if name:
+                data.add(name)
+
+    ordered = [t for t in all_tables if t in data]
+    return {"tables": ordered, "calculate": calculate and not ordered, "reason": "diff"}
+
+
+def refresh_request(plan: dict) -> dict | None:
+    """Enhanced refresh request body for a plan, or None when nothing needs processing."""
+    if plan["tables"]:
+        return {
+            "type": "full",
+            "commitMode": "transactional",
+            "applyRefreshPolicy": True,
+            "retryCount": 1,
+            "objects": [{"table": t} for t in plan["tables"]],
+        }
+    if plan["calculate"]:
+        return {"type": "calculate", "commitMode": "transactional"}
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Power BI REST
+# ---------------------------------------------------------------------------
+
+def _call(method: str, url: str, token: str, body: dict | None = None) -> tuple[dict, dict]:
+    data = json.dumps(body).encode() if body is not None else None
+    for attempt in range(MAX_THROTTLE_RETRIES + 1):
+        request = Request(url, data=data, method=method, headers={
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+        })
+        try:
+            with urlopen(request, timeout=60) as response:
+                raw = response.read()
+                return (json.loads(raw) if raw else {}), dict(response.headers)
+        except HTTPError as exc:
+            if exc.code != 429 or attempt == MAX_THROTTLE_RETRIES:
+                raise RuntimeError(f"{method} {url} failed: HTTP {exc.code} {exc.read().decode(errors='replace')}") from exc
+            wait = int(exc.headers.get("Retry-After", 2 ** attempt))
+            logger.warning("Throttled by Power BI API, retrying in %ds…", wait)
+            time.sleep(wait)
+    raise AssertionError("unreachable")
+
+
+def _dataset_id(token: str, workspace_id: str, name: str) -> str:
+    datasets, _ = _call("GET", f"{POWER_BI_API}/groups/{workspace_id}/datasets", token)
+    for dataset in datasets.get("value", []):
+        if dataset.get("name") == name:
+            return dataset["id"]
+    raise RuntimeError(f"Semantic model '{name}' not found in workspace {workspace_id}")
+
+
+def run_refresh(credential, workspace_id: str, name: str, body: dict,
+                timeout: int = REFRESH_TIMEOUT_SECONDS) -> None:
+    """Start an enhanced refresh and wait for it to finish; raises on failure."""
+    token = credential.get_token(POWER_BI_SCOPE).token
+    dataset_id = _dataset_id(token, workspace_id, name)
+    url = f"{POWER_BI_API}/groups/{workspace_id}/datasets/{dataset_id}/refreshes"
+    _, headers = _call("POST", url, token, body)
+    status_url = headers.get("Location") or f"{url}/{headers.get('RequestId', '')}"
+
+    deadline = time.monotonic() + timeout
+    while True:
+        time.sleep(POLL_INTERVAL_SECONDS)
+        token = credential.get_token(POWER_BI_SCOPE).token
+        status, _ = _call("GET", status_url, token)
+        state = status.get("extendedStatus") or status.get("status", "Unknown")
+        if state not in IN_PROGRESS_STATUSES:
+            break
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Refresh of '{name}' did not finish within {timeout}s")
+    if state != "Completed":
+        raise RuntimeError(f"Refresh of '{name}' ended with status {state}: {json.dumps(status.get('messages', []))}")
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def _model_name(model_dir: Path) -> str:
+    platform = model_dir / ".platform"
+    if platform.is_file():
+        metadata = json.loads(platform.read_text(encoding="utf-8-sig")).get("metadata", {})
+        if metadata.get("displayName"):
+            return metadata["displayName"]
+    return model_dir.name.rsplit(".", 1)[0]
+
+
+def refresh_changed_models(credential, workspace_id: str, repo_dir: str,
+                           base_ref: str | None, dry_run: bool = False) -> None:
+    """Refresh the tables of every *.SemanticModel under ``repo_dir`` changed since ``base_ref``.
+
+    ``base_ref`` is the commit last deployed to the workspace; None refreshes everything.
+    """
+    for model_dir in sorted(Path(repo_dir).glob("*.SemanticModel")):
+        if not (model_dir / "model.bim").is_file():
+            continue
+        name = _model_name(model_dir)
+        plan = plan_refresh(model_dir, base_ref)
+        body = refresh_request(plan)
+        if body is None:
+            logger.info("Semantic model %s: no data changes since %s, refresh skipped.", name, base_ref)
+            continue
+        logger.info(
+            "Semantic model %s (%s): %s", name, plan["reason"],
+            f"refreshing {', '.join(plan['tables'])}" if plan["tables"] else "recalculating",
+        )
+        if dry_run:
+            logger.info("  %s", json.dumps(body))
+            continue
+        start = time.monotonic()
+        run_refresh(credential, workspace_id, name, body)
+        logger.info("Semantic model %s refreshed in %.1f seconds.", name, time.monotonic() - start)
+
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%dT%H:%M:%S%z",
+        stream=sys.stdout,
+    )
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--dry-run", action="store_true", help="Print the refresh plan without calling Power BI")
+    args = parser.parse_args()
+
+    repo_dir = os.environ.get("REPO_DIR", DEFAULT_REPO_DIR)
+    credential, workspace_id = None, os.environ.get("TARGET_WORKSPACE_ID", "")
+    environment = os.environ.get("TARGET_ENVIRONMENT", "").upper()
+    if not args.dry_run:
+        from deploy_workspace import _build_credential, _env
+
+        workspace_id = _env("TARGET_WORKSPACE_ID")
+        environment = _env("TARGET_ENVIRONMENT").upper()
+        credential = _build_credential(environment)
+    history_db = os.environ.get("DEPLOY_HISTORY_DB", DEFAULT_HISTORY_DB)
+    base_ref = os.environ.get("DEPLOY_BASE_REF") or last_deployed_commit(environment, workspace_id, history_db)
+    logger.info("Last deployed commit: %s", base_ref or "unknown")
+
+    try:
+        refresh_changed_models(credential, workspace_id, repo_dir, base_ref, dry_run=args.dry_run)
+    except Exception:
+        logger.exception("Semantic model refresh failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+semantic_model.py — Helpers for reading and writing Sales_Report model.bim.
+
+model.bim is a TMSL database document. This module loads it, maps model tables
+back to the SQL tables their Power Query partitions read from, and writes it
+back in the repository's layout (2-space indent, one aligned line per column)
+so tool-driven edits produce reviewable diffs.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+DEFAULT_MODEL_PATH = "./workspace/Sales_Report.SemanticModel/model.bim"
+
+_M_NAVIGATION_RE = re.compile(r'\{\[Schema="(\w+)",\s*Item="(\w+)"\]\}')
+
+
+def load_model(path: str | Path = DEFAULT_MODEL_PATH) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8-sig"))
+
+
+def source_objects(table: dict) -> set[str]:
+    """Schema-qualified SQL objects read by a model table's M partitions."""
+    found = set()
+    for partition in table.get("partitions", []):
+        expression = partition.get("source", {}).get("expression", "")
+        text = "\n".join(expression) if isinstance(expression, list) else expression
+        found.update(f"{schema}.{item}" for schema, item in _M_NAVIGATION_RE.findall(text))
+    return found
+
+
+def primary_source(table: dict) -> str | None:
+    """The SQL object a model table imports: the first navigation in its M partition.
+
+    Later navigations (e.g. a parent table joined in to filter on its dates) are
+    lookups, not the table's source.
+    """
+    for partition in table.get("partitions", []):
+        expression = partition.get("source", {}).get("expression", "")
+        text = "\n".join(expression) if isinstance(expression, list) else expression
+        match = _M_NAVIGATION_RE.search(text)
+        if match:
+            return f"{match.group(1)}.{match.group(2)}"
+    return None
+
+
+def tables_by_source(model: dict) -> dict[str, str]:
+    """``{"SalesLT.Customer": "Customer", ...}`` for every import table in the model."""
+    mapping = {}
+    for table in model.get("model", {}).get("tables", []):
+        obj = primary_source(table)
+        if obj:
+            mapping[obj] = table["name"]
+    return mapping
+
+
+# ---------------------------------------------------------------------------
+# Serialization
+# ---------------------------------------------------------------------------
+
+def _column_blocks(text: str) -> list[tuple[list[dict], list[str]]]:
+    """Every ``"columns": [...]`` list in ``text`` as (parsed columns, raw lines)."""
+    blocks = []
+    lines = text.splitlines()
+    for start, line in enumerate(lines):
+        if not line.rstrip().endswith('"columns": ['):
+            continue
+        raw = []
+        for row in lines[start + 1:]:
+            if row.strip().startswith("]"):
+                break
+            raw.append(row.rstrip().removesuffix(","))
+        try:
+            blocks.append(([json.loads(row) for row in raw], raw))
+        except json.JSONDecodeError:
+            continue  # not one column per line; rendered fresh
+    return blocks
+
+
+def _render_columns(columns: list[dict], indent: str, original: list | None = None) -> str:
+    """One object per line, with fields padded so values line up down the list.
+
+    An unchanged column list found in ``original`` keeps its existing lines, so
+    hand alignment in the committed file is not churned.
+    """
+    for pos, (parsed, raw) in enumerate(original or []):
+        if parsed == columns:
+            original.pop(pos)
+            return "[\n" + ",\n".join(raw) + f"\n{indent}]"
+    rows = [[f"{json.dumps(k)}: {json.dumps(v, ensure_ascii=False)}" for k, v in c.items()] for c in columns]
+    widths: dict[int, int] = {}
+    for row in rows:
+        for pos, piece in enumerate(row):
+            widths[pos] = max(widths.get(pos, 0), len(piece) + 1)
+    lines = []
+    for row in rows:
+        cells = [(piece + ("," if pos < len(row) - 1 else "")).ljust(widths[pos]) for pos, piece in enumerate(row)]
+        lines.append(f"{indent}  {{ {' '.join(cells)}}}")
+    return "[\n" + ",\n".join(lines) + f"\n{indent}]"
+
+
+def _render(value, indent: str = "", key: str | None = None, original: list | None = None) -> str:
+    if key == "columns" and isinstance(value, list) and value and all(isinstance(c, dict) for c in value):
+        return _render_columns(value, indent, original)
+    inner = indent + "  "
+    if isinstance(value, dict) and value:
+        items = [f"{inner}{json.dumps(k)}: {_render(v, inner, k, original)}" for k, v in value.items()]
+        return "{\n" + ",\n".join(items) + f"\n{indent}}}"
+    if isinstance(value, list) and value:
+        items = [f"{inner}{_render(v, inner, None, original)}" for v in value]
+        return "[\n" + ",\n".join(items) + f"\n{indent}]"
+    return json.dumps(value, ensure_ascii=False)
+
+
+def dumps_model(model: dict, original: str | None = None) -> str:
+    """Render ``model``; pass the file's current text as ``original`` to keep its column lines."""
+    return _render(model, original=_column_blocks(original) if original else None) + "\n"
+
+
+def write_model(model: dict, path: str | Path = DEFAULT_MODEL_PATH) -> None:
+    path = Path(path)
+    original = path.read_text(encoding="utf-8-sig") if path.is_file() else None
+    path.write_text(dumps_model(model, original), encoding="utf-8")
@@ -0,0 +1,336 @@
+"""
+sql_project.py — Lightweight reader for the FSI_DB_01 SQL database project.
+
+Parses the CREATE TABLE / CREATE VIEW / CREATE INDEX scripts exported by Fabric
+Git integration (workspace/FSI_DB_01.SQLDatabase/<schema>/{Tables,Views}/*.sql),
+plus standalone index scripts in <schema>/Indexes/*.sql, into plain Python objects so the other deploy/ tools can reason about columns,
+primary keys, foreign keys and indexes without a database connection.
+
+This is not a general T-SQL parser. It understands the formatting produced by
+SqlPackage / the Fabric Git export, which is what lives in this repository.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+DEFAULT_PROJECT_DIR = "./workspace/FSI_DB_01.SQLDatabase"
+
+_CREATE_TABLE_RE = re.compile(r"CREATE\s+TABLE\s+\[(\w+)\]\.\[(\w+)\]\s*\(", re.IGNORECASE)
+_CREATE_VIEW_RE = re.compile(r"CREATE\s+VIEW\s+\[(\w+)\]\.\[(\w+)\]", re.IGNORECASE)
+_CREATE_INDEX_RE = re.compile(
+    r"CREATE\s+(UNIQUE\s+)?(CLUSTERED\s+|NONCLUSTERED\s+)?INDEX\s+\[(\w+)\]\s+"
+    r"ON\s+\[(\w+)\]\.\[(\w+)\]\s*\(([^)]*)\)(?:\s*INCLUDE\s*\(([^)]*)\))?",
+    re.IGNORECASE,
+)
+_PRIMARY_KEY_RE = re.compile(r"PRIMARY\s+KEY\s+(CLUSTERED|NONCLUSTERED)?\s*\(([^)]*)\)", re.IGNORECASE)
+_UNIQUE_RE = re.compile(r"UNIQUE\s+(CLUSTERED|NONCLUSTERED)?\s*\(([^)]*)\)", re.IGNORECASE)
+_FOREIGN_KEY_RE = re.compile(
+    r"FOREIGN\s+KEY\s*\(([^)]*)\)\s*REFERENCES\s+\[(\w+)\]\.\[(\w+)\]\s*\(([^)]*)\)",
+    re.IGNORECASE,
+)
+_CONSTRAINT_NAME_RE = re.compile(r"CONSTRAINT\s+\[(\w+)\]", re.IGNORECASE)
+_COLUMN_RE = re.compile(r"\[(\w+)\]\s+(.*)", re.DOTALL)
+_TYPE_STOP_WORDS = {"IDENTITY", "CONSTRAINT", "DEFAULT", "NULL", "NOT", "COLLATE", "SPARSE", "ROWGUIDCOL"}
+
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Column:
+    name: str
+    sql_type: str
+    nullable: bool = True
+    identity: bool = False
+    has_default: bool = False
+
+    @property
+    def base_type(self) -> str:
+        """Type name without length/precision, e.g. ``NVARCHAR`` for ``NVARCHAR(50)``."""
+        return self.sql_type.split("(", 1)[0].upper()
+
+    @property
+    def is_large_object(self) -> bool:
+        """True for (MAX) and legacy LOB types that are expensive to ship over an API."""
+        return "(MAX)" in self.sql_type.upper() or self.base_type in {"TEXT", "NTEXT", "IMAGE", "XML"}
+
+
+@dataclass
+class Index:
+    name: str
+    columns: list[str]
+    include: list[str] = field(default_factory=list)
+    unique: bool = False
+    clustered: bool = False
+    primary_key: bool = False
+
+
+@dataclass
+class ForeignKey:
+    name: str
+    columns: list[str]
+    ref_table: str  # schema-qualified, e.g. "SalesLT.Customer"
+    ref_columns: list[str]
+
+
+@dataclass
+class Table:
+    schema: str
+    name: str
+    columns: list[Column] = field(default_factory=list)
+    primary_key: list[str] = field(default_factory=list)
+    foreign_keys: list[ForeignKey] = field(default_factory=list)
+    indexes: list[Index] = field(default_factory=list)
+    path: Path | None = None
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.schema}.{self.name}"
+
+    def column(self, name: str) -> Column | None:
+        lowered = name.lower()
+        return next((c for c in self.columns if c.name.lower() == lowered), None)
+
+
+@dataclass
+class View:
+    schema: str
+    name: str
+    columns: list[str] = field(default_factory=list)
+    indexes: list[Index] = field(default_factory=list)
+    path: Path | None = None
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.schema}.{self.name}"
+
+
+@dataclass
+class SqlProject:
+    root: Path
+    tables: dict[str, Table] = field(default_factory=dict)
+    views: dict[str, View] = field(default_factory=dict)
+
+    def table(self, name: str) -> Table | None:
+        """Look up a table by ``Schema.Name`` or bare name (case-insensitive)."""
+        lowered = name.lower()
+        for key, table in self.tables.items():
+            if key.lower() == lowered or table.name.lower() == lowered:
+                return table
+        return None
+
+    def referenced_tables(self) -> set[str]:
+        """Schema-qualified names of tables that are the target of at least one FK."""
+        return {fk.ref_table for t in self.tables.values() for fk in t.foreign_keys}
+
+    def transactional_tables(self, date_columns: set[str]) -> set[str]:
+        """Tables with one of ``date_columns``, plus every table with an FK chain to one of them."""
+        found = {
+            t.full_name for t in self.tables.values()
+            if any(c.name in date_columns for c in t.columns)
+        }
+        changed = True
+        while changed:
+            changed = False
+            for table in self.tables.values():
+                if table.full_name not in found and any(fk.ref_table in found for fk in table.foreign_keys):
+                    found.add(table.full_name)
+                    changed = True
+        return found
+
+
+# ---------------------------------------------------------------------------
+# Parsing helpers
+# ---------------------------------------------------------------------------
+
+def _split_top_level(body: str) -> list[str]:
+    """Split a comma-separated list, ignoring commas nested inside parentheses."""
+    parts, depth, current = [], 0, []
+    for ch in body:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+    tail = "".join(current).strip()
+    if tail:
+        parts.append(tail)
+    return parts
+
+
+def _column_list(raw: str) -> list[str]:
+    """``[A] ASC, [B] DESC`` -> ``["A", "B"]``."""
+    return [re.sub(r"\s+(ASC|DESC)$", "", c.strip(), flags=re.IGNORECASE).strip("[] ") for c in raw.split(",") if c.strip()]
+
+
+def _table_body(sql: str, start: int) -> str:
+    """Return the text between the opening parenthesis at ``start`` and its match."""
+    depth = 0
+    for pos in range(start, len(sql)):
+        if sql[pos] == "(":
+            depth += 1
+        elif sql[pos] == ")":
+            depth -= 1
+            if depth == 0:
+                return sql[start + 1:pos]
+    raise ValueError("Unbalanced parentheses in CREATE TABLE statement")
+
+
+def _parse_column(definition: str) -> Column | None:
+    match = _COLUMN_RE.match(definition)
+    if not match:
+        return None
+    name, rest = match.groups()
+    type_tokens = []
+    for token in re.findall(r"\[?\w+\]?(?:\s*\([^)]*\))?", rest):
+        if re.match(r"\[?(\w+)", token).group(1).upper() in _TYPE_STOP_WORDS:
+            break
+        type_tokens.append(token)
+    sql_type = re.sub(r"\s+", "", " ".join(type_tokens)).strip("[]").upper()
+    upper = rest.upper()
+    return Column(
+        name=name,
+        sql_type=sql_type,
+        nullable="NOT NULL" not in upper,
+        identity="IDENTITY" in upper,
+        has_default="DEFAULT" in upper,
+    )
+
+
+def _parse_constraint(definition: str, table: Table) -> None:
+    name_match = _CONSTRAINT_NAME_RE.search(definition)
+    name = name_match.group(1) if name_match else ""
+
+    pk = _PRIMARY_KEY_RE.search(definition)
+    if pk:
+        table.primary_key = _column_list(pk.group(2))
+        table.indexes.append(Index(
+            name=name or f"PK_{table.name}",
+            columns=list(table.primary_key),
+            unique=True,
+            clustered=(pk.group(1) or "CLUSTERED").upper() == "CLUSTERED",
+            primary_key=True,
+        ))
+        return
+
+    fk = _FOREIGN_KEY_RE.search(definition)
+    if fk:
+        table.foreign_keys.append(ForeignKey(
+            name=name,
+            columns=_column_list(fk.group(1)),
+            ref_table=f"{fk.group(2)}.{fk.group(3)}",
+            ref_columns=_column_list(fk.group(4)),
+        ))
+        return
+
+    unique = _UNIQUE_RE.search(definition)
+    if unique:
+        table.indexes.append(Index(
+            name=name,
+            columns=_column_list(unique.group(2)),
+            unique=True,
+            clustered=(unique.group(1) or "").upper() == "CLUSTERED",
+        ))
+
+
+def _parse_indexes(sql: str) -> list[tuple[str, Index]]:
+    """Return ``(Schema.Object, Index)`` pairs for standalone CREATE INDEX statements."""
+    found = []
+    for m in _CREATE_INDEX_RE.finditer(sql):
+        unique, kind, name, schema, obj, cols, include = m.groups()
+        found.append((f"{schema}.{obj}", Index(
+            name=name,
+            columns=_column_list(cols),
+            include=_column_list(include) if include else [],
+            unique=bool(unique),
+            clustered=bool(kind) and kind.strip().upper() == "CLUSTERED",
+        )))
+    return found
+
+
+def _parse_view_columns(sql: str) -> list[str]:
+    """Best-effort output column names from the outermost (last) SELECT list."""
+    selects = [m.end() for m in re.finditer(r"\bSELECT\b", sql, re.IGNORECASE)]
+    if not selects:
+        return []
+    tail = sql[selects[-1]:]
+    from_match = re.search(r"\bFROM\b", tail, re.IGNORECASE)
+    select_list = tail[:from_match.start()] if from_match else tail
+    columns = []
+    for expr in _split_top_level(select_list):
+        alias = re.search(r"\bAS\s+\[?(\w+)\]?\s*$", expr, re.IGNORECASE)
+        if alias:
+            columns.append(alias.group(1))
+            continue
+        last = re.findall(r"\[?(\w+)\]?\s*$", expr)
+        if last:
+            columns.append(last[0])
+    return columns
+
+
+def parse_table_sql(sql: str, path: Path | None = None) -> Table | None:
+    """Parse a single Tables/*.sql script (CREATE TABLE plus trailing CREATE INDEX)."""
+    match = _CREATE_TABLE_RE.search(sql)
+    if not match:
+        return None
+    table = Table(schema=match.group(1), name=match.group(2), path=path)
+    for definition in _split_top_level(_table_body(sql, match.end() - 1)):
+        if definition.startswith("["):
+            column = _parse_column(definition)
+            if column:
+                table.columns.append(column)
+        else:
+            _parse_constraint(definition, table)
+    table.indexes.extend(index for owner, index in _parse_indexes(sql) if owner == table.full_name)
+    return table
+
+
+def parse_view_sql(sql: str, path: Path | None = None) -> View | None:
+    """Parse a single Views/*.sql script (CREATE VIEW plus trailing CREATE INDEX)."""
+    match = _CREATE_VIEW_RE.search(sql)
+    if not match:
+        return None
+    view = View(schema=match.group(1), name=match.group(2), path=path)
+    definition = sql.split("\nGO", 1)[0]
+    view.columns = _parse_view_columns(definition)
+    view.indexes = [index for owner, index in _parse_indexes(sql) if owner == view.full_name]
+    return view
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def load_sql_project(project_dir: str | Path = DEFAULT_PROJECT_DIR, schemas: set[str] | None = None) -> SqlProject:
+    """Load every table, view and standalone index script under ``project_dir``.
+
+    ``schemas`` optionally restricts the result to the given schema names
+    (e.g. ``{"SalesLT"}``).
+    """
+    root = Path(project_dir)
+    if not root.is_dir():
+        raise FileNotFoundError(f"SQL project directory not found: {root}")
+
+    project = SqlProject(root=root)
+    for path in sorted(root.glob("*/Tables/*.sql")):
+        table = parse_table_sql(path.read_text(encoding="utf-8-sig"), path)
+        if table and (schemas is None or table.schema in schemas):
+            project.tables[table.full_name] = table
+    for path in sorted(root.glob("*/Views/*.sql")):
+        view = parse_view_sql(path.read_text(encoding="utf-8-sig"), path)
+        if view and (schemas is None or view.schema in schemas):
+            project.views[view.full_name] = view
+    for path in sorted(root.glob("*/Indexes/*.sql")):
+        for owner, index in _parse_indexes(path.read_text(encoding="utf-8-sig")):
+            target = project.tables.get(owner) or project.views.get(owner)
+            if target is not None and all(existing.name != index.name for existing in target.indexes):
+                target.indexes.append(index)
+    return project
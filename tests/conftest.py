@@ -0,0 +1,7 @@
+"""Make the deploy/ scripts importable the way they import each other."""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "deploy"))
@@ -0,0 +1,49 @@
+"""advise_indexes.py --write must produce indexes the next run recognises."""
+
+import shutil
+import subprocess
+import sys
+
+from conftest import REPO_ROOT
+from sql_project import load_sql_project
+
+SCRIPT = REPO_ROOT / "deploy" / "advise_indexes.py"
+PROJECT = "FSI_DB_01.SQLDatabase"
+NOTEBOOK = "Notebook_Sales.Notebook"
+
+
+def _advise(workspace, *args):
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), "--repo-dir", str(workspace),
+         "--project-dir", str(workspace / PROJECT), *args],
+        capture_output=True, text=True,
+    )
+
+
+def _workspace_copy(tmp_path):
+    workspace = tmp_path / "workspace"
+    for item in (PROJECT, NOTEBOOK):
+        shutil.copytree(REPO_ROOT / "workspace" / item, workspace / item)
+    return workspace
+
+
+def test_written_indexes_are_loaded(tmp_path):
+    workspace = _workspace_copy(tmp_path)
+    assert _advise(workspace, "--write").returncode == 0
+
+    written = sorted((workspace / PROJECT / "SalesLT" / "Indexes").glob("*.sql"))
+    assert written
+    project = load_sql_project(workspace / PROJECT)
+    loaded = {ix.name for table in project.tables.values() for ix in table.indexes}
+    assert {path.stem for path in written} <= loaded
+
+
+def test_write_then_rerun_clears_the_gate(tmp_path):
+    workspace = _workspace_copy(tmp_path)
+    assert _advise(workspace, "--fail-above", "50").returncode == 1
+
+    assert _advise(workspace, "--write").returncode == 0
+
+    rerun = _advise(workspace, "--fail-above", "50")
+    assert rerun.returncode == 0, rerun.stderr
+    assert "All analyzed access paths are served by existing indexes." in rerun.stderr
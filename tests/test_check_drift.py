@@ -0,0 +1,57 @@
+"""check_drift.py against the local Fabric API stand-in."""
+
+import json
+import subprocess
+import sys
+
+from check_drift import normalize_part
+from conftest import REPO_ROOT
+
+SCRIPT = REPO_ROOT / "deploy" / "check_drift.py"
+MODEL = REPO_ROOT / "workspace" / "Sales_Report.SemanticModel" / "model.bim"
+
+
+def _check(tmp_path, *args):
+    report = tmp_path / "drift.json"
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT), "--standin", "--standin-latency", "0", "--json-out", str(report), *args],
+        capture_output=True, text=True, cwd=REPO_ROOT,
+    )
+    return result, json.loads(report.read_text(encoding="utf-8"))
+
+
+def test_refreshed_model_matches_repository():
+    model = json.loads(MODEL.read_text(encoding="utf-8-sig"))
+    policy_tables = [t for t in model["model"]["tables"] if t.get("refreshPolicy")]
+    assert policy_tables
+    for table in policy_tables:
+        table["partitions"] = [{"name": "2025", "mode": "import", "state": "ready",
+                                "source": {"type": "policyRange", "start": "2025-01-01T00:00:00",
+                                           "end": "2026-01-01T00:00:00", "granularity": "year"}}]
+        table["lastProcessed"] = "2026-01-02T06:00:00Z"
+    deployed = json.dumps(model, indent=4).encode()
+
+    assert normalize_part("model.bim", deployed, {}) == normalize_part("model.bim", MODEL.read_bytes(), {})
+
+
+def test_model_edit_is_still_drift():
+    model = json.loads(MODEL.read_text(encoding="utf-8-sig"))
+    model["model"]["tables"][0]["columns"][0]["dataType"] = "string"
+    edited = json.dumps(model).encode()
+
+    assert normalize_part("model.bim", edited, {}) != normalize_part("model.bim", MODEL.read_bytes(), {})
+
+
+def test_standin_in_sync(tmp_path):
+    result, drift = _check(tmp_path)
+
+    assert result.returncode == 0, result.stdout
+    assert drift == []
+
+
+def test_standin_reports_portal_edits(tmp_path):
+    result, drift = _check(tmp_path, "--standin-drift", "2")
+
+    assert result.returncode == 1
+    kinds = sorted((d["environment"], d["kind"]) for d in drift)
+    assert kinds == sorted([(env, kind) for env in ("QA", "PROD") for kind in ("definition", "definition", "unmanaged")])
@@ -0,0 +1,95 @@
+"""Refresh policies must partition on OrderDate and regenerate model.bim unchanged."""
+
+import copy
+import shutil
+import subprocess
+import sys
+
+from configure_incremental_refresh import (
+    CHANGE_DETECTION_COLUMN,
+    PARTITION_DATE_COLUMN,
+    apply_policy,
+    filter_expression,
+    partition_path,
+)
+from conftest import REPO_ROOT
+from semantic_model import dumps_model, load_model
+from sql_project import load_sql_project
+
+SCRIPT = REPO_ROOT / "deploy" / "configure_incremental_refresh.py"
+MODEL_PATH = REPO_ROOT / "workspace" / "Sales_Report.SemanticModel" / "model.bim"
+PROJECT = load_sql_project(REPO_ROOT / "workspace" / "FSI_DB_01.SQLDatabase")
+
+# SalesOrderDetail's M query as it was before any policy was added.
+DETAIL_QUERY = [
+    "let",
+    '    Source = Sql.Database("dev-sql-server.database.windows.net", "FSI_DB_01"),',
+    '    SalesLT_SalesOrderDetail = Source{[Schema="SalesLT",Item="SalesOrderDetail"]}[Data]',
+    "in",
+    "    SalesLT_SalesOrderDetail",
+]
+
+
+def _tables():
+    return {t["name"]: t for t in load_model(MODEL_PATH)["model"]["tables"]}
+
+
+def test_header_partitions_on_its_own_order_date():
+    assert partition_path(_tables()["SalesOrderHeader"], PROJECT) == (PARTITION_DATE_COLUMN, None)
+
+
+def test_detail_partitions_on_the_header_order_date():
+    column, via = partition_path(_tables()["SalesOrderDetail"], PROJECT)
+
+    assert column == PARTITION_DATE_COLUMN
+    assert via.ref_table == "SalesLT.SalesOrderHeader"
+    assert via.columns == via.ref_columns == ["SalesOrderID"]
+
+
+def test_tables_without_an_order_date_are_skipped():
+    tables = _tables()
+
+    assert partition_path(tables["Customer"], PROJECT) is None
+    assert partition_path(tables["Product"], PROJECT) is None
+
+
+def test_detail_join_filters_the_header_and_is_idempotent():
+    _, via = partition_path(_tables()["SalesOrderDetail"], PROJECT)
+
+    once = filter_expression(list(DETAIL_QUERY), PARTITION_DATE_COLUMN, via)
+
+    assert once[-2:] == ["in", '    #"Filtered Rows"']
+    joined = "\n".join(once)
+    assert 'Source{[Schema="SalesLT",Item="SalesOrderHeader"]}[Data], {"SalesOrderID", "OrderDate"}' in joined
+    assert "each [OrderDate] >= RangeStart and [OrderDate] < RangeEnd" in joined
+    assert "JoinKind.Inner" in joined
+    assert CHANGE_DETECTION_COLUMN not in joined
+    assert filter_expression(list(once), PARTITION_DATE_COLUMN, via) == once
+
+
+def test_reapplying_the_policy_changes_nothing():
+    table = _tables()["SalesOrderDetail"]
+    before = copy.deepcopy(table)
+    _, via = partition_path(table, PROJECT)
+
+    apply_policy(table, PARTITION_DATE_COLUMN, 3, 10, via)
+
+    assert table == before
+
+
+def test_check_fails_when_the_policy_is_removed_by_hand(tmp_path):
+    model = tmp_path / "model.bim"
+    shutil.copy(MODEL_PATH, model)
+
+    def check():
+        return subprocess.run([sys.executable, str(SCRIPT), "--check", "--model", str(model),
+                               "--project-dir", str(REPO_ROOT / "workspace" / "FSI_DB_01.SQLDatabase")],
+                              capture_output=True, text=True).returncode
+
+    assert check() == 0
+    edited = load_model(model)
+    for table in edited["model"]["tables"]:
+        table.pop("refreshPolicy", None)
+    model.write_text(dumps_model(edited, model.read_text(encoding="utf-8-sig")), encoding="utf-8")
+    assert load_model(model)
+    assert check() == 1
@@ -0,0 +1,55 @@
+"""PublishTimer against log lines captured from fabric-cicd 0.1.2."""
+
+import logging
+
+from deploy_history import PublishTimer
+
+# (logger, message) as fabric-cicd 0.1.2 emits them while publishing two models.
+CAPTURED = [
+    ("fabric_cicd.fabric_workspace", "Publishing SemanticModel 'Sales_Report'"),
+    ("fabric_cicd._common._fabric_endpoint", "Operation in progress. Checking again in 1 second (Attempt 1/5)..."),
+    ("fabric_cicd._common._fabric_endpoint", "Operation in progress. Checking again in 2 seconds (Attempt 2/5)..."),
+    ("fabric_cicd._common._fabric_endpoint", "API is throttled. Checking again in 20 seconds (Attempt 1/5)..."),
+    ("fabric_cicd.fabric_workspace", "Published"),
+    ("fabric_cicd.fabric_workspace", "Publishing SemanticModel 'Finance'"),
+    ("fabric_cicd._common._fabric_endpoint", "Item name is reserved.  Checking again in 5 seconds (Attempt 1/5)..."),
+    ("fabric_cicd._common._fabric_endpoint", "AAD token expired. Refreshing token."),
+    ("fabric_cicd._common._fabric_endpoint", "Operation in progress. Checking again in 0.50 seconds (Attempt 0/5)..."),
+    ("fabric_cicd.fabric_workspace", "Published"),
+]
+NOT_RETRIES = [
+    ("fabric_cicd._common._fabric_endpoint", "Operation in progress. Checking again in 10 seconds (Attempt 3/5)..."),
+    ("fabric_cicd.fabric_workspace", "Found parameter file 'config/parameter.yml'"),
+    ("fabric_cicd._common._fabric_endpoint", "Executing as Application Id '00000000-0000-0000-0000-000000000000'"),
+]
+
+
+def _replay(lines):
+    timer = PublishTimer()
+    parent = logging.getLogger("fabric_cicd")
+    parent.addHandler(timer)
+    try:
+        with timer.batch("SemanticModel", {"Sales_Report": 100, "Finance": 50}) as batch:
+            for name, message in lines:
+                logging.getLogger(name).info(message)
+    finally:
+        parent.removeHandler(timer)
+    return batch
+
+
+def test_counts_retries_but_not_operation_polls(caplog):
+    caplog.set_level(logging.INFO, logger="fabric_cicd")
+    batch = _replay(CAPTURED + NOT_RETRIES)
+
+    retries = {item.name: item.retries for item in batch.items}
+    assert retries == {"Sales_Report": 1, "Finance": 2}
+    assert batch.retries == 3
+    assert all(item.outcome == "succeeded" for item in batch.items)
+
+
+def test_ignores_ordinary_progress_lines(caplog):
+    caplog.set_level(logging.INFO, logger="fabric_cicd")
+    polls = [line for line in CAPTURED if line[1].startswith("Operation in progress.")]
+    batch = _replay([CAPTURED[0], *polls, *NOT_RETRIES, CAPTURED[4]])
+
+    assert batch.retries == 0
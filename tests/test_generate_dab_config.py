@@ -0,0 +1,54 @@
+"""generate_dab_config.py must keep hand-set permissions while adding the read projection."""
+
+from conftest import REPO_ROOT
+from generate_dab_config import CRUD_ACTIONS, build_config
+from sql_project import load_sql_project
+
+PROJECT = load_sql_project(REPO_ROOT / "workspace" / "FSI_DB_01.SQLDatabase", schemas={"SalesLT"})
+CUSTOMER_EXCLUDED = ["PasswordHash", "PasswordSalt", "rowguid"]
+
+
+def _customer(permissions):
+    existing = {"entities": {"Customers": {"source": {"object": "SalesLT.Customer", "type": "table"},
+                                           "permissions": permissions}}}
+    return build_config(PROJECT, existing)["entities"]["Customers"]["permissions"]
+
+
+def _actions(permissions, role):
+    return {a["action"]: a for p in permissions if p["role"] == role for a in p["actions"]}
+
+
+def test_narrowed_include_is_kept():
+    permissions = _customer([{"role": "authenticated", "actions": [
+        {"action": "read", "fields": {"include": ["CustomerID", "FirstName"]}},
+    ]}])
+
+    assert _actions(permissions, "authenticated")["read"]["fields"] == {
+        "include": ["CustomerID", "FirstName"], "exclude": CUSTOMER_EXCLUDED,
+    }
+
+
+def test_existing_excludes_are_extended():
+    permissions = _customer([{"role": "authenticated", "actions": [
+        {"action": "read", "fields": {"include": ["*"], "exclude": ["Phone"]}},
+    ]}])
+
+    assert _actions(permissions, "authenticated")["read"]["fields"]["exclude"] == ["Phone", *CUSTOMER_EXCLUDED]
+
+
+def test_wildcard_expands_to_crud_with_projected_read():
+    permissions = _customer([{"role": "admin", "actions": ["*"]}])
+
+    actions = _actions(permissions, "admin")
+    assert list(actions) == CRUD_ACTIONS
+    assert actions["read"]["fields"] == {"include": ["*"], "exclude": CUSTOMER_EXCLUDED}
+    assert all("fields" not in actions[name] for name in ("create", "update", "delete"))
+
+
+def test_projection_is_idempotent():
+    permissions = [{"role": "authenticated", "actions": [
+        {"action": "read", "fields": {"include": ["CustomerID", "FirstName"]}},
+    ]}]
+    once = _customer(permissions)
+
+    assert _customer(once) == once
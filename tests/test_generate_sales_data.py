@@ -0,0 +1,66 @@
+"""generate_sales_data.py output must load next to the AdventureWorksLT sample."""
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pyarrow")
+
+from conftest import REPO_ROOT  # noqa: E402
+from generate_sales_data import CATEGORIES, SAMPLE_MAX_IDS, SalesDataGenerator  # noqa: E402
+from sql_project import load_sql_project  # noqa: E402
+
+PROJECT = load_sql_project(REPO_ROOT / "workspace" / "FSI_DB_01.SQLDatabase")
+SAMPLE_CATEGORY_NAMES = {name for parent, _, leaves in CATEGORIES for name in (parent, *leaves)}
+
+
+def _tables(empty_target):
+    generator = SalesDataGenerator(PROJECT, 200, 30, 500, "2024-01-01", "2024-12-31", 1, empty_target)
+    address, link = generator.addresses_chunk(1, generator.addresses, 0)
+    header, detail = generator.orders_chunk(0, 500, 1, 0)
+    tables = {
+        "ProductCategory": generator.product_categories(), "Product": generator.products(),
+        "Customer": generator.customers_chunk(1, 200, 0), "Address": address, "CustomerAddress": link,
+        "SalesOrderHeader": header, "SalesOrderDetail": detail,
+    }
+    return {name: table.to_pydict() for name, table in tables.items()}
+
+
+def _ids(tables):
+    return {
+        "ProductCategory": tables["ProductCategory"]["ProductCategoryID"],
+        "Product": tables["Product"]["ProductID"],
+        "Customer": tables["Customer"]["CustomerID"],
+        "Address": tables["Address"]["AddressID"],
+        "SalesOrderHeader": tables["SalesOrderHeader"]["SalesOrderID"],
+        "SalesOrderDetail": tables["SalesOrderDetail"]["SalesOrderDetailID"],
+    }
+
+
+def test_ids_and_category_names_clear_the_sample():
+    tables = _tables(empty_target=False)
+
+    for table, ids in _ids(tables).items():
+        assert min(ids) == SAMPLE_MAX_IDS[table] + 1, table
+    assert not set(tables["ProductCategory"]["Name"]) & SAMPLE_CATEGORY_NAMES
+
+
+def test_empty_target_starts_at_one():
+    tables = _tables(empty_target=True)
+
+    assert all(min(ids) == 1 for ids in _ids(tables).values())
+    assert set(tables["ProductCategory"]["Name"]) == SAMPLE_CATEGORY_NAMES
+
+
+@pytest.mark.parametrize("empty_target", [False, True])
+def test_foreign_keys_resolve(empty_target):
+    tables = _tables(empty_target)
+    categories = set(tables["ProductCategory"]["ProductCategoryID"])
+    links = set(zip(tables["CustomerAddress"]["CustomerID"], tables["CustomerAddress"]["AddressID"]))
+    header = tables["SalesOrderHeader"]
+
+    assert {p for p in tables["ProductCategory"]["ParentProductCategoryID"] if p is not None} <= categories
+    assert set(tables["Product"]["ProductCategoryID"]) <= categories
+    assert set(zip(header["CustomerID"], header["BillToAddressID"])) <= links
+    assert set(zip(header["CustomerID"], header["ShipToAddressID"])) <= links
+    assert set(tables["SalesOrderDetail"]["SalesOrderID"]) <= set(header["SalesOrderID"])
+    assert set(tables["SalesOrderDetail"]["ProductID"]) <= set(tables["Product"]["ProductID"])
@@ -0,0 +1,136 @@
+"""plan_refresh must reload only the tables a change between two commits touches."""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+from conftest import REPO_ROOT
+from refresh_semantic_model import plan_refresh, refresh_request
+
+MODEL = "workspace/Sales_Report.SemanticModel"
+TABLES_DIR = "workspace/FSI_DB_01.SQLDatabase/SalesLT/Tables"
+PARAMETER_FILE = "config/parameter.yml"
+ALL_TABLES = ["Customer", "Product", "ProductCategory", "SalesOrderHeader", "SalesOrderDetail"]
+
+
+def _git(repo, *args):
+    return subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A git repo holding the model, the SQL table scripts and parameter.yml, with one commit."""
+    for path in (MODEL, TABLES_DIR):
+        shutil.copytree(REPO_ROOT / path, tmp_path / path)
+    (tmp_path / "config").mkdir()
+    shutil.copy(REPO_ROOT / PARAMETER_FILE, tmp_path / PARAMETER_FILE)
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "base")
+    return tmp_path
+
+
+def _edit_model(repo, change):
+    path = repo / MODEL / "model.bim"
+    model = json.loads(path.read_text(encoding="utf-8-sig"))
+    change(model["model"])
+    path.write_text(json.dumps(model, indent=2), encoding="utf-8")
+
+
+def _plan_after(repo, message):
+    base = _git(repo, "rev-parse", "HEAD")
+    _git(repo, "commit", "-q", "-am", message)
+    return plan_refresh(repo / MODEL, base)
+
+
+def _table(model, name):
+    return next(t for t in model["tables"] if t["name"] == name)
+
+
+def test_measure_only_change_needs_no_processing(repo):
+    _edit_model(repo, lambda m: _table(m, "SalesOrderHeader")["measures"].append(
+        {"name": "Order Count", "expression": "COUNTROWS(SalesOrderHeader)"}))
+
+    plan = _plan_after(repo, "measure")
+
+    assert plan == {"tables": [], "calculate": False, "reason": "diff"}
+    assert refresh_request(plan) is None
+
+
+def test_relationship_only_change_recalculates(repo):
+    _edit_model(repo, lambda m: m["relationships"].pop())
+
+    plan = _plan_after(repo, "relationship")
+
+    assert plan == {"tables": [], "calculate": True, "reason": "diff"}
+    assert refresh_request(plan) == {"type": "calculate", "commitMode": "transactional"}
+
+
+def test_column_change_reloads_that_table(repo):
+    _edit_model(repo, lambda m: _table(m, "Product")["columns"][0].update({"formatString": "0"}))
+
+    assert _plan_after(repo, "column")["tables"] == ["Product"]
+
+
+def test_sql_table_script_change_reloads_the_model_table(repo):
+    script = repo / TABLES_DIR / "SalesOrderDetail.sql"
+    script.write_text(script.read_text(encoding="utf-8") + "\n-- widened\n", encoding="utf-8")
+
+    plan = _plan_after(repo, "sql")
+
+    assert plan["tables"] == ["SalesOrderDetail"]
+    assert refresh_request(plan)["objects"] == [{"table": "SalesOrderDetail"}]
+
+
+def test_sql_script_without_model_table_reloads_nothing(repo):
+    script = repo / TABLES_DIR / "ProductModel.sql"
+    script.write_text(script.read_text(encoding="utf-8") + "\n-- unrelated\n", encoding="utf-8")
+
+    assert _plan_after(repo, "sql")["tables"] == []
+
+
+def test_parameter_file_change_reloads_everything(repo):
+    parameters = repo / PARAMETER_FILE
+    parameters.write_text(parameters.read_text(encoding="utf-8") + "\n# changed\n", encoding="utf-8")
+
+    plan = _plan_after(repo, "parameters")
+
+    assert plan["tables"] == ALL_TABLES
+    assert plan["reason"] == f"{PARAMETER_FILE} changed"
+
+
+def test_connection_change_reloads_everything(repo):
+    _edit_model(repo, lambda m: m["expressions"].append({"name": "Server", "kind": "m", "expression": '"x"'}))
+
+    plan = _plan_after(repo, "connection")
+
+    assert plan["tables"] == ALL_TABLES
+    assert plan["reason"] == "connection or parameters changed"
+
+
+def test_range_parameters_are_not_a_connection_change(repo):
+    def move_range(model):
+        for expression in model["expressions"]:
+            if expression["name"] == "RangeStart":
+                expression["expression"] = expression["expression"].replace("2020", "2021")
+    _edit_model(repo, move_range)
+
+    assert _plan_after(repo, "range")["tables"] == []
+
+
+def test_without_a_deployed_commit_everything_reloads(repo):
+    plan = plan_refresh(repo / MODEL, None)
+
+    assert plan["tables"] == ALL_TABLES
+    assert plan["reason"] == "no previously deployed commit recorded"
+
+
+def test_unknown_base_ref_reloads_everything(repo):
+    plan = plan_refresh(repo / MODEL, "0" * 40)
+
+    assert plan["tables"] == ALL_TABLES
+    assert plan["reason"].endswith("unavailable")
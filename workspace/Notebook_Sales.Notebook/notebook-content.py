@@ -16,6 +16,9 @@
 # ─────────────────────────────────────────────
 import os
 import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import pandas as pd
 import pyodbc
@@ -26,17 +29,21 @@ from notebookutils import mssparkutils
 FABRIC_SERVER   = os.environ.get("FABRIC_SQL_SERVER",   "zylcdhpgv7uezc6dy7d3ngcwyi-kmmmko2hhaeunmdplvelcbfeyu.database.fabric.microsoft.com")
 FABRIC_DATABASE = os.environ.get("FABRIC_SQL_DATABASE", "FSI_DB_01-0dbbbcd5-5c8b-4667-94d4-915037183d73")
 
-# Acquire an AAD token scoped to Azure SQL / Fabric SQL
-token       = mssparkutils.credentials.getToken("https://database.windows.net/")
-token_bytes = token.encode("UTF-16-LE")
-token_struct = struct.pack(f"<I{len(token_bytes)}s", len(token_bytes), token_bytes)
 
-conn = pyodbc.connect(
-    f"Driver={{ODBC Driver 18 for SQL Server}};"
-    f"Server={FABRIC_SERVER};"
-    f"Database={FABRIC_DATABASE};",
-    attrs_before={1256: token_struct},
-)
+def connect():
+    """Open a new connection, authenticated with an AAD token scoped to Azure SQL / Fabric SQL."""
+    token        = mssparkutils.credentials.getToken("https://database.windows.net/")
+    token_bytes  = token.encode("UTF-16-LE")
+    token_struct = struct.pack(f"<I{len(token_bytes)}s", len(token_bytes), token_bytes)
+    return pyodbc.connect(
+        f"Driver={{ODBC Driver 18 for SQL Server}};"
+        f"Server={FABRIC_SERVER};"
+        f"Database={FABRIC_DATABASE};",
+        attrs_before={1256: token_struct},
+    )
+
+
+conn = connect()
 cursor = conn.cursor()
 print(f"Connected to {FABRIC_DATABASE} on {FABRIC_SERVER} ✓")
 
@@ -128,8 +135,57 @@ print(f"Inserted {len(seed_order_ids)} test sales orders → IDs: {seed_order_id
 # CELL ********************
 
 # ─────────────────────────────────────────────
-# Cell 3 – Top 10 Customers by Total Revenue
+# Cell 3 – Run the analytics queries concurrently
+# The queries behind Cells 4–8 and 12 are independent reads, so they run
+# side by side on their own connections (pyodbc connections are not
+# shareable across threads) and the cells below only display the results.
 # ─────────────────────────────────────────────
+ANALYTICS_MAX_CONNECTIONS = int(os.environ.get("ANALYTICS_MAX_CONNECTIONS", "6"))
+
+
+def query_workers(queries, max_connections=ANALYTICS_MAX_CONNECTIONS):
+    """Number of worker threads (and connections) run_queries uses for ``queries``."""
+    return max(1, min(max_connections, len(queries)))
+
+
+def run_queries(queries, connect, max_connections=ANALYTICS_MAX_CONNECTIONS):
+    """Run named read queries concurrently over at most ``max_connections`` connections.
+
+    Returns ``(results, timings)``: a DataFrame and the elapsed seconds per query
+    name, both in the order the queries were given.
+    """
+    local  = threading.local()
+    opened = []
+    lock   = threading.Lock()
+
+    def run(sql):
+        if not hasattr(local, "conn"):
+            local.conn = connect()
+            with lock:
+                opened.append(local.conn)
+        start = time.perf_counter()
+        df = pd.read_sql(sql, local.conn)
+        return df, time.perf_counter() - start
+
+    results, timings = {}, {}
+    workers = query_workers(queries, max_connections)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analytics") as pool:
+            futures = {pool.submit(run, sql): name for name, sql in queries.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name], timings[name] = future.result()
+                except Exception as exc:
+                    for pending in futures:
+                        pending.cancel()
+                    raise RuntimeError(f"Analytics query '{name}' failed: {exc}") from exc
+    finally:
+        for connection in opened:
+            connection.close()
+    return {name: results[name] for name in queries}, {name: timings[name] for name in queries}
+
+
 sql_top_customers = """
 SELECT TOP 10
     c.CustomerID,
@@ -143,22 +199,6 @@ GROUP BY c.CustomerID, c.FirstName, c.LastName, c.CompanyName
 ORDER BY TotalRevenue DESC;
 """
 
-df_top_customers = pd.read_sql(sql_top_customers, conn)
-print("=== Top 10 Customers by Revenue ===")
-display(df_top_customers)
-
-# METADATA ********************
-
-# META {
-# META   "language": "python",
-# META   "language_group": "synapse_pyspark"
-# META }
-
-# CELL ********************
-
-# ─────────────────────────────────────────────
-# Cell 4 – Monthly Sales Trend (current year)
-# ─────────────────────────────────────────────
 sql_monthly_sales = """
 SELECT
     YEAR(OrderDate)  AS OrderYear,
@@ -172,22 +212,6 @@ GROUP BY YEAR(OrderDate), MONTH(OrderDate)
 ORDER BY OrderYear, OrderMonth;
 """
 
-df_monthly = pd.read_sql(sql_monthly_sales, conn)
-print("=== Monthly Sales Trend ===")
-display(df_monthly)
-
-# METADATA ********************
-
-# META {
-# META   "language": "python",
-# META   "language_group": "synapse_pyspark"
-# META }
-
-# CELL ********************
-
-# ─────────────────────────────────────────────
-# Cell 5 – Revenue by Product Category
-# ─────────────────────────────────────────────
 sql_category_revenue = """
 SELECT
     pc.Name                             AS Category,
@@ -201,22 +225,6 @@ GROUP BY pc.Name
 ORDER BY CategoryRevenue DESC;
 """
 
-df_categories = pd.read_sql(sql_category_revenue, conn)
-print("=== Revenue by Product Category ===")
-display(df_categories)
-
-# METADATA ********************
-
-# META {
-# META   "language": "python",
-# META   "language_group": "synapse_pyspark"
-# META }
-
-# CELL ********************
-
-# ─────────────────────────────────────────────
-# Cell 6 – Top 10 Best-Selling Products
-# ─────────────────────────────────────────────
 sql_best_sellers = """
 SELECT TOP 10
     p.ProductID,
@@ -232,22 +240,6 @@ GROUP BY p.ProductID, p.Name, p.ProductNumber, p.Color, p.ListPrice
 ORDER BY TotalUnitsSold DESC;
 """
 
-df_best_sellers = pd.read_sql(sql_best_sellers, conn)
-print("=== Top 10 Best-Selling Products ===")
-display(df_best_sellers)
-
-# METADATA ********************
-
-# META {
-# META   "language": "python",
-# META   "language_group": "synapse_pyspark"
-# META }
-
-# CELL ********************
-
-# ─────────────────────────────────────────────
-# Cell 7 – Average Order Value by Customer Segment
-# ─────────────────────────────────────────────
 sql_aov = """
 SELECT
     CASE
@@ -263,7 +255,129 @@ GROUP BY CustomerID
 ORDER BY SegmentRevenue DESC;
 """
 
-df_aov = pd.read_sql(sql_aov, conn)
+sql_no_recent_orders = """
+SELECT
+    p.ProductID,
+    p.Name          AS ProductName,
+    p.ProductNumber,
+    p.ListPrice,
+    p.SellStartDate,
+    p.SellEndDate,
+    ISNULL(CONVERT(VARCHAR(20), latest.LastOrderDate, 23), 'Never') AS LastOrderDate
+FROM SalesLT.Product p
+LEFT JOIN (
+    SELECT
+        sod.ProductID,
+        MAX(soh.OrderDate) AS LastOrderDate
+    FROM SalesLT.SalesOrderDetail sod
+    JOIN SalesLT.SalesOrderHeader soh ON sod.SalesOrderID = soh.SalesOrderID
+    GROUP BY sod.ProductID
+) latest ON p.ProductID = latest.ProductID
+WHERE latest.LastOrderDate IS NULL
+   OR latest.LastOrderDate < DATEADD(YEAR, -1, GETDATE())
+ORDER BY p.ListPrice DESC;
+"""
+
+analytics_queries = {
+    "top_customers": sql_top_customers,
+    "monthly_sales": sql_monthly_sales,
+    "category_revenue": sql_category_revenue,
+    "best_sellers": sql_best_sellers,
+    "aov": sql_aov,
+    "no_recent_orders": sql_no_recent_orders,
+}
+
+wall_start = time.perf_counter()
+analytics, analytics_timings = run_queries(analytics_queries, connect)
+wall_seconds = time.perf_counter() - wall_start
+
+print(f"=== Ran {len(analytics)} queries on {query_workers(analytics_queries)} connections "
+      f"in {wall_seconds:.2f}s (sequential total {sum(analytics_timings.values()):.2f}s) ===")
+display(
+    pd.DataFrame({
+        "Query":   list(analytics_timings),
+        "Seconds": [round(t, 3) for t in analytics_timings.values()],
+        "Rows":    [len(df) for df in analytics.values()],
+    }).sort_values("Seconds", ascending=False)
+)
+
+# METADATA ********************
+
+# META {
+# META   "language": "python",
+# META   "language_group": "synapse_pyspark"
+# META }
+
+# CELL ********************
+
+# ─────────────────────────────────────────────
+# Cell 4 – Top 10 Customers by Total Revenue
+# ─────────────────────────────────────────────
+df_top_customers = analytics["top_customers"]
+print("=== Top 10 Customers by Revenue ===")
+display(df_top_customers)
+
+# METADATA ********************
+
+# META {
+# META   "language": "python",
+# META   "language_group": "synapse_pyspark"
+# META }
+
+# CELL ********************
+
+# ─────────────────────────────────────────────
+# Cell 5 – Monthly Sales Trend (current year)
+# ─────────────────────────────────────────────
+df_monthly = analytics["monthly_sales"]
+print("=== Monthly Sales Trend ===")
+display(df_monthly)
+
+# METADATA ********************
+
+# META {
+# META   "language": "python",
+# META   "language_group": "synapse_pyspark"
+# META }
+
+# CELL ********************
+
+# ─────────────────────────────────────────────
+# Cell 6 – Revenue by Product Category
+# ─────────────────────────────────────────────
+df_categories = analytics["category_revenue"]
+print("=== Revenue by Product Category ===")
+display(df_categories)
+
+# METADATA ********************
+
+# META {
+# META   "language": "python",
+# META   "language_group": "synapse_pyspark"
+# META }
+
+# CELL ********************
+
+# ─────────────────────────────────────────────
+# Cell 7 – Top 10 Best-Selling Products
+# ─────────────────────────────────────────────
+df_best_sellers = analytics["best_sellers"]
+print("=== Top 10 Best-Selling Products ===")
+display(df_best_sellers)
+
+# METADATA ********************
+
+# META {
+# META   "language": "python",
+# META   "language_group": "synapse_pyspark"
+# META }
+
+# CELL ********************
+
+# ─────────────────────────────────────────────
+# Cell 8 – Average Order Value by Customer Segment
+# ─────────────────────────────────────────────
+df_aov = analytics["aov"]
 # Re-aggregate at segment level
 df_segment = (
     df_aov.groupby("CustomerSegment")
@@ -285,7 +399,7 @@ display(df_segment)
 # CELL ********************
 
 # ─────────────────────────────────────────────
-# Cell 8 – INSERT: Add a new customer
+# Cell 9 – INSERT: Add a new customer
 # ─────────────────────────────────────────────
 sql_insert_customer = """
 INSERT INTO SalesLT.Customer
@@ -320,7 +434,7 @@ new_customer_id = row.CustomerID
 # CELL ********************
 
 # ─────────────────────────────────────────────
-# Cell 9 – UPDATE: Change the new customer's phone
+# Cell 10 – UPDATE: Change the new customer's phone
 # ─────────────────────────────────────────────
 sql_update_customer = """
 UPDATE SalesLT.Customer
@@ -351,7 +465,7 @@ print(f"Verified Phone: {row.Phone}")
 # CELL ********************
 
 # ─────────────────────────────────────────────
-# Cell 10 – DELETE: Remove the demo customer
+# Cell 11 – DELETE: Remove the demo customer
 # ─────────────────────────────────────────────
 sql_delete_customer = "DELETE FROM SalesLT.Customer WHERE CustomerID = ?;"
 
@@ -377,32 +491,9 @@ print(f"Rows remaining for CustomerID {new_customer_id}: {count}")
 # CELL ********************
 
 # ─────────────────────────────────────────────
-# Cell 11 – Products with Low Stock / No Recent Orders
+# Cell 12 – Products with Low Stock / No Recent Orders
 # ─────────────────────────────────────────────
-sql_no_recent_orders = """
-SELECT
-    p.ProductID,
-    p.Name          AS ProductName,
-    p.ProductNumber,
-    p.ListPrice,
-    p.SellStartDate,
-    p.SellEndDate,
-    ISNULL(CONVERT(VARCHAR(20), latest.LastOrderDate, 23), 'Never') AS LastOrderDate
-FROM SalesLT.Product p
-LEFT JOIN (
-    SELECT
-        sod.ProductID,
-        MAX(soh.OrderDate) AS LastOrderDate
-    FROM SalesLT.SalesOrderDetail sod
-    JOIN SalesLT.SalesOrderHeader soh ON sod.SalesOrderID = soh.SalesOrderID
-    GROUP BY sod.ProductID
-) latest ON p.ProductID = latest.ProductID
-WHERE latest.LastOrderDate IS NULL
-   OR latest.LastOrderDate < DATEADD(YEAR, -1, GETDATE())
-ORDER BY p.ListPrice DESC;
-"""
-
-df_stale = pd.read_sql(sql_no_recent_orders, conn)
+df_stale = analytics["no_recent_orders"]
 print(f"=== Products with No Orders in Last 12 Months ({len(df_stale)} rows) ===")
 display(df_stale.head(20))
 
@@ -421,22 +512,13 @@ print("\nConnection closed.")
 # CELL ********************
 
 # ─────────────────────────────────────────────
-# Cell 12 – Cleanup: Remove seed test data
+# Cell 13 – Cleanup: Remove seed test data
 # Deletes the orders and customers inserted in Cell 2.
 # Run this cell after verifying the Top Customers query.
 # ─────────────────────────────────────────────
 
-# Re-open connection for cleanup (Cell 11 closes it)
-token2        = mssparkutils.credentials.getToken("https://database.windows.net/")
-token2_bytes  = token2.encode("UTF-16-LE")
-token2_struct = struct.pack(f"<I{len(token2_bytes)}s", len(token2_bytes), token2_bytes)
-
-conn2   = pyodbc.connect(
-    f"Driver={{ODBC Driver 18 for SQL Server}};"
-    f"Server={FABRIC_SERVER};"
-    f"Database={FABRIC_DATABASE};",
-    attrs_before={1256: token2_struct},
-)
+# Re-open connection for cleanup (Cell 12 closes it)
+conn2   = connect()
 cursor2 = conn2.cursor()
 
 # Delete seeded orders first (FK constraint)